@@ -35,8 +35,7 @@ def create_app(config_name=None, url_prefix='/flask'):
             'status': 'healthy',
             'timestamp': datetime.now().isoformat(),
             'service': 'RefNet Research Paper Search API',
-            'version': '1.0.0',
-            'pyalex_version': '0.18'
+            'version': '1.0.0'
         })
     
     # Serve React app for all non-API routes
@@ -67,6 +66,7 @@ def create_app(config_name=None, url_prefix='/flask'):
                     'graph_neighbors': f'{url_prefix}/api/graph/<paper_id>/neighbors',
                     'graph_stats': f'{url_prefix}/api/graph/stats',
                     'graph_data': f'{url_prefix}/api/graph/data',
+                    'graph_arrow': f'{url_prefix}/api/graph/arrow/<nodes|edges>',
                     'clear_graph': f'{url_prefix}/api/graph/clear (POST)',
                     'health': f'{url_prefix}/health'
                 }
@@ -1,6 +1,6 @@
 """Graph API routes for RefNet."""
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 from datetime import datetime
 
 from ..services.graph_service import GraphService
@@ -129,9 +129,17 @@ def clear_graph():
 
 @graph_bp.route('/graph/data', methods=['GET'])
 def get_graph_data():
-    """Get the current graph data."""
+    """
+    Get the current graph data.
+    
+    Query parameters:
+    - format: 'records' (default, one object per node/edge) or 'columns' (one list per field)
+    """
     try:
-        graph_data = graph_service.get_graph_data()
+        if request.args.get('format') == 'columns':
+            graph_data = graph_service.get_graph_columns()
+        else:
+            graph_data = graph_service.get_graph_data()
         
         return jsonify({
             'graph': graph_data,
@@ -139,4 +147,25 @@ def get_graph_data():
         })
     
     except Exception as e:
-        return jsonify({'error': 'Failed to get graph data', 'details': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': 'Failed to get graph data', 'details': str(e)}), 500
+
+
+@graph_bp.route('/graph/arrow/<table>', methods=['GET'])
+def get_graph_arrow(table):
+    """
+    Get the current graph data as an Arrow IPC stream.
+    
+    Path parameters:
+    - table: 'nodes' or 'edges'
+    """
+    if table not in ('nodes', 'edges'):
+        return jsonify({'error': "Table must be one of: nodes, edges"}), 400
+    
+    try:
+        payload = graph_service.export_graph_arrow(table)
+        return Response(payload, mimetype='application/vnd.apache.arrow.stream')
+    
+    except ImportError:
+        return jsonify({'error': 'Arrow export requires pyarrow to be installed'}), 501
+    except Exception as e:
+        return jsonify({'error': 'Failed to export graph data', 'details': str(e)}), 500
@@ -3,13 +3,13 @@
 from flask import Blueprint, request, jsonify
 from datetime import datetime
 
-from ..services.openalex_service import OpenAlexService
+from ..services.openalex_service import get_shared_openalex_service
 from ..utils.validators import validate_paper_id
 
 paper_bp = Blueprint('paper', __name__)
 
 # Initialize service
-openalex_service = OpenAlexService()
+openalex_service = get_shared_openalex_service()
 
 
 @paper_bp.route('/paper/<path:paper_id>', methods=['GET'])
@@ -56,7 +56,7 @@ def get_paper_citations(paper_id):
         papers = []
         if citing_data.get('results'):
             for raw_paper in citing_data['results']:
-                paper = openalex_service.get_paper_by_id(raw_paper.get('id', ''))
+                paper = openalex_service.format_raw_paper_data(raw_paper)
                 if paper:
                     papers.append(paper.to_dict())
         
@@ -3,13 +3,13 @@
 from flask import Blueprint, request, jsonify
 from datetime import datetime
 
-from ..services.openalex_service import OpenAlexService
+from ..services.openalex_service import get_shared_openalex_service
 from ..utils.validators import validate_search_params
 
 search_bp = Blueprint('search', __name__)
 
 # Initialize service
-openalex_service = OpenAlexService()
+openalex_service = get_shared_openalex_service()
 
 
 @search_bp.route('/search', methods=['GET'])
@@ -1,7 +1,7 @@
 """Services for RefNet."""
 
-from .openalex_service import OpenAlexService
+from .openalex_service import OpenAlexService, get_shared_openalex_service
 from .graph_service import GraphService
 
-__all__ = ['OpenAlexService', 'GraphService']
+__all__ = ['OpenAlexService', 'GraphService', 'get_shared_openalex_service']
 
@@ -1,13 +1,100 @@
 """Service for building and managing citation graphs."""
 
-from typing import Dict, List, Set, Optional, Any
+import logging
+from typing import Dict, List, Optional, Any, Tuple
 import networkx as nx
+import numpy as np
+from scipy.sparse.csgraph import connected_components
 from datetime import datetime
 
 from ..models.paper import Paper
-from ..models.graph import GraphData, GraphNode, GraphEdge, GraphMetadata
-from ..services.openalex_service import OpenAlexService
-from ..utils.validators import validate_paper_id
+from ..services.openalex_service import OpenAlexService, get_shared_openalex_service
+from ..utils.validators import validate_paper_id, validate_paper_id_fast
+
+logger = logging.getLogger(__name__)
+
+
+def _neighbor_summary(node_id: str, paper: Paper) -> Dict[str, Any]:
+    """Project a paper onto the fields returned for neighboring papers."""
+    return {
+        'id': node_id,
+        'title': paper.title,
+        'authors': paper.authors,
+        'year': paper.year,
+        'citations': paper.citations
+    }
+
+
+def _cap_frontier(next_level: List[str], max_frontier: Optional[int]) -> List[str]:
+    """Keep at most max_frontier papers (in discovery order) for the next expansion level."""
+    if max_frontier is not None and len(next_level) > max_frontier:
+        return next_level[:max_frontier]
+    return next_level
+
+
+def _fruchterman_reingold(adjacency, iterations: int = 20, k: Optional[float] = None,
+                          seed: Optional[int] = None) -> np.ndarray:
+    """
+    Vectorized Fruchterman-Reingold layout over a sparse adjacency matrix.
+    
+    Repulsion is computed for blocks of rows at a time so memory stays bounded
+    on large graphs; attraction is computed over the edge list only.
+    
+    Args:
+        adjacency: Square scipy sparse adjacency matrix (direction is ignored)
+        iterations: Number of force iterations
+        k: Optimal distance between nodes (defaults to 1/sqrt(n))
+        seed: Seed for the random initial positions
+        
+    Returns:
+        (n, 2) array of node positions
+    """
+    num_nodes = adjacency.shape[0]
+    rng = np.random.default_rng(seed)
+    pos = rng.random((num_nodes, 2))
+    if num_nodes < 2:
+        return pos
+    
+    undirected = (adjacency + adjacency.T).tocoo()
+    rows, cols = undirected.row, undirected.col
+    if k is None:
+        k = np.sqrt(1.0 / num_nodes)
+    
+    # Linearly cooling temperature, as in networkx
+    temperature = 0.1 * max(np.ptp(pos[:, 0]), np.ptp(pos[:, 1]))
+    cooling = temperature / (iterations + 1)
+    block_size = max(1, 2_000_000 // num_nodes)
+    
+    for _ in range(iterations):
+        x, y = pos[:, 0], pos[:, 1]
+        displacement = np.empty_like(pos)
+        
+        # Repulsion between every pair of nodes
+        for start in range(0, num_nodes, block_size):
+            stop = min(start + block_size, num_nodes)
+            dx = x[start:stop, np.newaxis] - x
+            dy = y[start:stop, np.newaxis] - y
+            distance = np.sqrt(dx * dx + dy * dy)
+            np.clip(distance, 0.01, None, out=distance)
+            repulsion = k * k / (distance * distance)
+            displacement[start:stop, 0] = (dx * repulsion).sum(axis=1)
+            displacement[start:stop, 1] = (dy * repulsion).sum(axis=1)
+        
+        # Attraction along edges
+        delta = pos[rows] - pos[cols]
+        distance = np.linalg.norm(delta, axis=-1)
+        np.clip(distance, 0.01, None, out=distance)
+        attraction = delta * (distance / k)[:, np.newaxis]
+        displacement[:, 0] -= np.bincount(rows, weights=attraction[:, 0], minlength=num_nodes)
+        displacement[:, 1] -= np.bincount(rows, weights=attraction[:, 1], minlength=num_nodes)
+        
+        # Near-zero forces take a small fixed step instead of blowing up, as in networkx
+        length = np.linalg.norm(displacement, axis=-1)
+        length[length < 0.01] = 0.1
+        pos += displacement * (temperature / length)[:, np.newaxis]
+        temperature -= cooling
+    
+    return pos
 
 
 class GraphService:
@@ -18,14 +105,89 @@ class GraphService:
         Initialize graph service.
         
         Args:
-            openalex_service: OpenAlex service instance
+            openalex_service: OpenAlex service instance (defaults to the shared one)
         """
         self.graph = nx.DiGraph()
-        self.added_papers: Set[str] = set()
-        self.openalex_service = openalex_service or OpenAlexService()
-        self.paper_cache: Dict[str, Paper] = {}  # Cache for papers
+        # Papers in (or claimed for) the graph, keyed by normalized ID
+        self._papers: Dict[str, Paper] = {}
+        self.openalex_service = openalex_service or get_shared_openalex_service()
+        self.paper_cache: Dict[str, Paper] = {}  # Prefetched papers, keyed by normalized ID
+        # CSR adjacency snapshot, rebuilt lazily after the graph changes
+        self._csr = None
+        self._csr_nodes: List[str] = []
+        self._csr_dirty = True
+        # igraph mirror of the CSR snapshot for C-level layout
+        self._igraph = None
+        self._layout: Optional[Dict[str, Any]] = None
+        self._num_components: Optional[int] = None
+        # get_graph_data output, tagged with the graph version it was built from
+        self._graph_version = 0
+        self._graph_data_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+        self._graph_stats_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+    
+    def _mark_dirty(self) -> None:
+        """Invalidate derived structures after the graph has been mutated."""
+        self._graph_version += 1
+        self._graph_data_cache = None
+        self._graph_stats_cache = None
+        self._csr_dirty = True
+        self._igraph = None
+        self._layout = None
+        self._num_components = None
+    
+    def _get_csr(self):
+        """
+        Get a CSR adjacency matrix of the current graph.
+        
+        Row/column i corresponds to self._csr_nodes[i].
+        """
+        if self._csr_dirty or self._csr is None:
+            self._csr_nodes = list(self.graph.nodes())
+            self._csr = nx.to_scipy_sparse_array(
+                self.graph, nodelist=self._csr_nodes, weight=None, format='csr'
+            )
+            self._csr_dirty = False
+        return self._csr
     
-    def add_paper_to_graph(self, paper_id: str, is_root: bool = False, paper_data: Optional[Paper] = None) -> bool:
+    def _get_degrees(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get in- and out-degree arrays of the current graph in one pass over the CSR.
+        
+        Returns:
+            Tuple of (in_degrees, out_degrees), indexed like self._csr_nodes
+        """
+        csr = self._get_csr()
+        in_degrees = np.asarray(csr.sum(axis=0)).ravel()
+        out_degrees = np.asarray(csr.sum(axis=1)).ravel()
+        return in_degrees, out_degrees
+    
+    def _get_num_components(self) -> int:
+        """Count weakly connected components, reusing the count until the graph changes."""
+        if self._num_components is None:
+            num_components, _ = connected_components(self._get_csr(), directed=True, connection='weak')
+            self._num_components = int(num_components)
+        return self._num_components
+    
+    def _get_igraph(self):
+        """
+        Get an igraph mirror of the current graph.
+        
+        Vertex i corresponds to self._csr_nodes[i].
+        """
+        if self._igraph is None:
+            import igraph as ig
+            
+            csr = self._get_csr()
+            coo = csr.tocoo()
+            self._igraph = ig.Graph(
+                n=csr.shape[0],
+                edges=list(zip(coo.row.tolist(), coo.col.tolist())),
+                directed=True
+            )
+        return self._igraph
+    
+    def add_paper_to_graph(self, paper_id: str, is_root: bool = False,
+                           paper_data: Optional[Paper] = None) -> Optional[str]:
         """
         Add a paper to the graph.
         
@@ -35,11 +197,35 @@ class GraphService:
             paper_data: Pre-fetched paper data (optional)
             
         Returns:
-            True if successfully added, False otherwise
+            Normalized paper ID if successfully added, None otherwise
+        """
+        node = self._claim_paper(paper_id, is_root=is_root, paper_data=paper_data)
+        if node is None:
+            return None
+        
+        self.graph.add_node(node[0], **node[1])
+        self._mark_dirty()
+        return node[0]
+    
+    def _claim_paper(self, paper_id: str, is_root: bool = False,
+                     paper_data: Optional[Paper] = None) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Validate, fetch and filter a paper and reserve its ID in _papers.
+        
+        The graph itself is not touched; callers add the returned node, which
+        lets the build loops insert a whole build with add_nodes_from.
+        
+        Args:
+            paper_id: Paper ID to add
+            is_root: Whether this is a root paper
+            paper_data: Pre-fetched paper data (optional)
+            
+        Returns:
+            Tuple of (normalized_id, node_attributes), or None if the paper is rejected
         """
         is_valid, normalized_id = validate_paper_id(paper_id)
-        if not is_valid or normalized_id in self.added_papers:
-            return False
+        if not is_valid or normalized_id in self._papers:
+            return None
         
         # Use provided paper data, check cache, or fetch it
         if paper_data:
@@ -50,25 +236,69 @@ class GraphService:
             # Use the original paper_id for the API call, not the normalized one
             paper = self.openalex_service.get_paper_by_id(paper_id)
             if not paper:
-                return False
-            # Cache the paper for future use using both IDs
+                return None
+            # Cache the paper for future use
             self.paper_cache[normalized_id] = paper
-            self.paper_cache[paper.id] = paper
         
         # Apply strict author filtering for non-root papers - match frontend logic
         if not is_root:
             # Use same logic as frontend: d.authors && d.authors.length > 0
             if not paper.authors or not isinstance(paper.authors, list) or len(paper.authors) == 0:
-                return False
+                return None
         
         # Note: We don't skip papers with 0 citations as they might be legitimate papers
         
-        # Add node to graph
-        self.graph.add_node(normalized_id, **paper.to_dict())
-        self.added_papers.add(normalized_id)
+        self._papers[normalized_id] = paper
         if paper.id != normalized_id:
-            self.added_papers.add(paper.id)
-        return True
+            # e.g. a DOI root: also claim its OpenAlex ID so it isn't added twice
+            self._papers[paper.id] = paper
+        # The Paper itself is stored and serialized on read
+        return normalized_id, {'paper': paper}
+    
+    @staticmethod
+    def _level_targets(current_level: List[str], combined_data: Dict[str, Dict[str, List[str]]],
+                       top_cited_limit: int, top_references_limit: int) -> Dict[str, Tuple[List[str], List[str]]]:
+        """
+        Slice each paper's citations and references to the per-paper limits once.
+        
+        Args:
+            current_level: Paper IDs being expanded, in order
+            combined_data: Result of get_citations_and_references_batch
+            top_cited_limit: Number of citing papers to keep per paper
+            top_references_limit: Number of referenced papers to keep per paper
+            
+        Returns:
+            Dictionary mapping paper ID to (citing_ids, reference_ids)
+        """
+        targets = {}
+        for paper_id in current_level:
+            data = combined_data.get(paper_id, {})
+            targets[paper_id] = (
+                data.get('citations', [])[:top_cited_limit],
+                data.get('references', [])[:top_references_limit]
+            )
+        return targets
+    
+    def _prefetch_papers(self, paper_ids) -> None:
+        """
+        Batch-fetch papers that are not yet in the graph into paper_cache.
+        
+        Args:
+            paper_ids: Candidate paper ID strings from OpenAlex data (raw or normalized)
+        """
+        # Remove already processed papers to avoid unnecessary API calls
+        new_paper_ids = [
+            paper_id for paper_id in set(paper_ids)
+            if validate_paper_id_fast(paper_id)[1] not in self._papers
+        ]
+        if not new_paper_ids:
+            return
+        
+        logger.debug("Fetching %d new papers", len(new_paper_ids))
+        for paper in self.openalex_service.get_papers_batch(new_paper_ids):
+            is_valid, normalized_id = validate_paper_id_fast(paper.id)
+            if is_valid:
+                self.paper_cache[normalized_id] = paper
     
     def is_paper_in_graph(self, paper_id: str) -> bool:
         """
@@ -80,10 +310,13 @@ class GraphService:
         Returns:
             True if paper is in graph, False otherwise
         """
+        # Already-normalized IDs need only the membership lookup
+        if isinstance(paper_id, str) and paper_id in self._papers:
+            return True
         is_valid, normalized_id = validate_paper_id(paper_id)
         if not is_valid:
             return False
-        return normalized_id in self.added_papers or paper_id in self.added_papers
+        return normalized_id in self._papers
     
     def get_paper_from_graph(self, paper_id: str) -> Optional[Dict]:
         """
@@ -98,7 +331,7 @@ class GraphService:
         is_valid, normalized_id = validate_paper_id(paper_id)
         if not is_valid or normalized_id not in self.graph:
             return None
-        return self.graph.nodes[normalized_id]
+        return self.graph.nodes[normalized_id]['paper'].to_dict()
     
     def remove_paper_from_graph(self, paper_id: str) -> bool:
         """
@@ -114,18 +347,26 @@ class GraphService:
         if not is_valid or normalized_id not in self.graph:
             return False
         
-        # Remove all edges connected to this node
-        edges_to_remove = list(self.graph.edges(normalized_id))
-        for edge in edges_to_remove:
-            self.graph.remove_edge(*edge)
-        
-        # Remove the node
+        # Removing the node also removes all of its edges
         self.graph.remove_node(normalized_id)
-        self.added_papers.discard(normalized_id)
+        self._mark_dirty()
+        self._forget_paper(normalized_id)
         return True
     
+    def _forget_paper(self, normalized_id: str) -> None:
+        """
+        Drop a paper (and its alias, if any) from graph membership.
+        
+        Args:
+            normalized_id: Normalized paper ID
+        """
+        paper = self._papers.pop(normalized_id, None)
+        if paper is not None and paper.id != normalized_id:
+            self._papers.pop(paper.id, None)
+    
     def build_graph_from_roots(self, root_paper_ids: List[str], iterations: int = 3,
-                              top_cited_limit: int = 5, top_references_limit: int = 5) -> Dict[str, Any]:
+                              top_cited_limit: int = 5, top_references_limit: int = 5,
+                              max_frontier: Optional[int] = None) -> Dict[str, Any]:
         """
         Build a citation graph starting from multiple root papers using batch operations.
         
@@ -134,39 +375,38 @@ class GraphService:
             iterations: Number of expansion iterations
             top_cited_limit: Number of top cited papers per iteration
             top_references_limit: Number of top reference papers per iteration
+            max_frontier: Maximum papers expanded per iteration (None for no limit)
             
         Returns:
             Graph data or error information
         """
         # Reset graph state for each new request
         self.graph.clear()
-        self.added_papers.clear()
+        self._mark_dirty()
+        self._papers.clear()
         self.paper_cache.clear()
         
-        print(f"🔍 Building graph from {len(root_paper_ids)} root papers: {root_paper_ids}")
+        logger.debug("Building graph from %d root papers: %s", len(root_paper_ids), root_paper_ids)
         
         # Add all root papers first
         valid_root_ids = []
         for root_id in root_paper_ids:
-            if self.add_paper_to_graph(root_id, is_root=True):
-                is_valid, normalized_id = validate_paper_id(root_id)
-                if is_valid:
-                    valid_root_ids.append(normalized_id)
-                else:
-                    print(f"❌ Invalid root paper ID: {root_id}")
+            normalized_id = self.add_paper_to_graph(root_id, is_root=True)
+            if normalized_id:
+                valid_root_ids.append(normalized_id)
             else:
-                print(f"❌ Failed to add root paper: {root_id}")
+                logger.warning("Failed to add root paper: %s", root_id)
         
         if not valid_root_ids:
             return {'error': 'Could not fetch any root papers'}
         
-        current_level = valid_root_ids.copy()
+        current_level = valid_root_ids
+        # Nodes and edges for the whole build, inserted once after the loop
+        pending_nodes = []
+        pending_edges = []
         
         for iteration in range(iterations):
-            print(f"🔄 Iteration {iteration + 1}: Processing {len(current_level)} papers")
-            
-            # Collect all paper IDs to process in this iteration
-            papers_to_process = current_level.copy()
+            logger.debug("Iteration %d: processing %d papers", iteration + 1, len(current_level))
             
             # Calculate multiples for efficient API calls - use 3x multiplier
             cited_multiple = min(200, top_cited_limit * 5)  # 3x multiplier, max 200
@@ -174,60 +414,54 @@ class GraphService:
             
             # Batch get citations and references for all papers (combined call)
             combined_data = self.openalex_service.get_citations_and_references_batch(
-                papers_to_process, 
+                current_level,
                 cited_per_page=cited_multiple,
                 ref_per_page=ref_multiple
             )
-            citations_map = {paper_id: data['citations'] for paper_id, data in combined_data.items()}
-            references_map = {paper_id: data['references'] for paper_id, data in combined_data.items()}
+            targets = self._level_targets(current_level, combined_data, top_cited_limit, top_references_limit)
             
             # Collect all new paper IDs we'll need
             all_new_paper_ids = set()
-            for paper_id in current_level:
-                citing_paper_ids = citations_map.get(paper_id, [])[:top_cited_limit]
-                reference_paper_ids = references_map.get(paper_id, [])[:top_references_limit]
+            for citing_paper_ids, reference_paper_ids in targets.values():
                 all_new_paper_ids.update(citing_paper_ids)
                 all_new_paper_ids.update(reference_paper_ids)
             
             # Batch fetch all new papers
-            if all_new_paper_ids:
-                print(f"📚 Fetching {len(all_new_paper_ids)} new papers...")
-                papers_data = self.openalex_service.get_papers_batch(list(all_new_paper_ids))
-                
-                # Add papers to cache
-                for paper_data in papers_data:
-                    if paper_data and paper_data.id:
-                        self.paper_cache[paper_data.id] = paper_data
+            self._prefetch_papers(all_new_paper_ids)
             
-            # Process each paper in current level
+            # Process each paper in current level, collecting nodes and edges.
+            # _claim_paper hands out each ID once, so next_level has no duplicates
+            # and no paper is expanded twice.
             next_level = []
-            for paper_id in current_level:
-                citing_paper_ids = citations_map.get(paper_id, [])[:top_cited_limit]
-                reference_paper_ids = references_map.get(paper_id, [])[:top_references_limit]
-                
+            for paper_id, (citing_paper_ids, reference_paper_ids) in targets.items():
                 # Process citations
                 for citing_id in citing_paper_ids:
-                    if self.add_paper_to_graph(citing_id):
-                        is_valid, normalized_citing_id = validate_paper_id(citing_id)
-                        if is_valid:
-                            self.graph.add_edge(normalized_citing_id, paper_id)
-                            next_level.append(normalized_citing_id)
+                    node = self._claim_paper(citing_id)
+                    if node:
+                        pending_nodes.append(node)
+                        pending_edges.append((node[0], paper_id))
+                        next_level.append(node[0])
                 
                 # Process references
                 for ref_id in reference_paper_ids:
-                    if self.add_paper_to_graph(ref_id):
-                        is_valid, normalized_ref_id = validate_paper_id(ref_id)
-                        if is_valid:
-                            self.graph.add_edge(paper_id, normalized_ref_id)
-                            next_level.append(normalized_ref_id)
+                    node = self._claim_paper(ref_id)
+                    if node:
+                        pending_nodes.append(node)
+                        pending_edges.append((paper_id, node[0]))
+                        next_level.append(node[0])
             
-            current_level = next_level
-            print(f"✅ Iteration {iteration + 1} complete. Next level: {len(current_level)} papers")
+            current_level = _cap_frontier(next_level, max_frontier)
+            logger.debug("Iteration %d complete, next level: %d papers", iteration + 1, len(current_level))
         
+        # Insert the whole build at once
+        self.graph.add_nodes_from(pending_nodes)
+        self.graph.add_edges_from(pending_edges)
+        self._mark_dirty()
         return self.get_graph_data()
 
     def build_graph_from_root(self, root_paper_id: str, iterations: int = 3,
-                            top_cited_limit: int = 5, top_references_limit: int = 5) -> Dict[str, Any]:
+                            top_cited_limit: int = 5, top_references_limit: int = 5,
+                            max_frontier: Optional[int] = None) -> Dict[str, Any]:
         """
         Build a citation graph starting from a root paper using batch operations.
         
@@ -236,23 +470,25 @@ class GraphService:
             iterations: Number of expansion iterations
             top_cited_limit: Number of top cited papers per iteration
             top_references_limit: Number of top reference papers per iteration
+            max_frontier: Maximum papers expanded per iteration (None for no limit)
             
         Returns:
             Graph data or error information
         """
         # Reset graph state for each new request
         self.graph.clear()
-        self.added_papers.clear()
+        self._mark_dirty()
+        self._papers.clear()
         self.paper_cache.clear()
         
-        if not self.add_paper_to_graph(root_paper_id, is_root=True):
+        normalized_id = self.add_paper_to_graph(root_paper_id, is_root=True)
+        if not normalized_id:
             return {'error': 'Could not fetch root paper'}
         
-        is_valid, normalized_id = validate_paper_id(root_paper_id)
-        if not is_valid:
-            return {'error': 'Invalid paper ID'}
-        
         current_level = [normalized_id]
+        # Nodes and edges for the whole build, inserted once after the loop
+        nodes_to_add = []
+        edges_to_add = []
         
         for iteration in range(iterations):
             # Calculate multiples for efficient API calls - use 3x multiplier
@@ -265,59 +501,46 @@ class GraphService:
                 cited_per_page=cited_multiple,
                 ref_per_page=ref_multiple
             )
-            citations_map = {paper_id: data['citations'] for paper_id, data in combined_data.items()}
-            references_map = {paper_id: data['references'] for paper_id, data in combined_data.items()}
+            targets = self._level_targets(current_level, combined_data, top_cited_limit, top_references_limit)
             
             # Collect all new paper IDs we'll need for the next layer (pre-filter duplicates)
             all_new_paper_ids = set()
-            for paper_id in current_level:
-                all_new_paper_ids.update(citations_map.get(paper_id, [])[:top_cited_limit])
-                all_new_paper_ids.update(references_map.get(paper_id, [])[:top_references_limit])
-            
-            # Remove already processed papers to avoid unnecessary API calls
-            all_new_paper_ids -= self.added_papers
+            for citing_ids, reference_ids in targets.values():
+                all_new_paper_ids.update(citing_ids)
+                all_new_paper_ids.update(reference_ids)
             
             # Batch fetch all new papers for the next layer at once
-            if all_new_paper_ids:
-                batch_papers = self.openalex_service.get_papers_batch(list(all_new_paper_ids))
-                # Cache all papers at once
-                for paper in batch_papers:
-                    is_valid, normalized_id = validate_paper_id(paper.id)
-                    if is_valid:
-                        self.paper_cache[normalized_id] = paper
-                        self.paper_cache[paper.id] = paper
+            self._prefetch_papers(all_new_paper_ids)
             
             # Process all papers in the current level and add their connections
             next_level = []
-            edges_to_add = []
             
-            for paper_id in current_level:
-                is_valid_current, normalized_current_id = validate_paper_id(paper_id)
-                if not is_valid_current:
-                    continue
+            # current_level only ever holds normalized IDs returned by _claim_paper
+            for paper_id, (citing_ids, reference_ids) in targets.items():
+                # Process citations and references
+                for citing_id in citing_ids:
+                    node = self._claim_paper(citing_id)
+                    if node:
+                        nodes_to_add.append(node)
+                        edges_to_add.append((paper_id, node[0]))
+                        next_level.append(node[0])
                 
-                # Process citations and references with pre-validation
-                for citing_id in citations_map.get(paper_id, [])[:top_cited_limit]:
-                    if citing_id not in self.added_papers:
-                        is_valid, normalized_citing_id = validate_paper_id(citing_id)
-                        if is_valid and self.add_paper_to_graph(citing_id):
-                            edges_to_add.append((normalized_current_id, normalized_citing_id))
-                            next_level.append(normalized_citing_id)
-                
-                for ref_id in references_map.get(paper_id, [])[:top_references_limit]:
-                    if ref_id not in self.added_papers:
-                        is_valid, normalized_ref_id = validate_paper_id(ref_id)
-                        if is_valid and self.add_paper_to_graph(ref_id):
-                            edges_to_add.append((normalized_current_id, normalized_ref_id))
-                            next_level.append(normalized_ref_id)
-            
-            # Add all edges at once
-            self.graph.add_edges_from(edges_to_add)
-            current_level = next_level
+                for ref_id in reference_ids:
+                    node = self._claim_paper(ref_id)
+                    if node:
+                        nodes_to_add.append(node)
+                        edges_to_add.append((paper_id, node[0]))
+                        next_level.append(node[0])
+            
+            current_level = _cap_frontier(next_level, max_frontier)
             
             if not current_level:
                 break
         
+        # Add all nodes and edges at once
+        self.graph.add_nodes_from(nodes_to_add)
+        self.graph.add_edges_from(edges_to_add)
+        self._mark_dirty()
         return self.get_graph_data()
     
     def build_graph_from_multiple_roots(self, root_paper_ids: List[str], 
@@ -335,14 +558,11 @@ class GraphService:
         Returns:
             Graph data or error information
         """
-        for root_paper_id in root_paper_ids:
-            result = self.build_graph_from_root(
-                root_paper_id, iterations, top_cited_limit, top_references_limit
-            )
-            if 'error' in result:
-                return result
-        
-        return self.get_graph_data()
+        # build_graph_from_root resets the graph on every call, so looping over it
+        # kept only the last root; the batch builder expands all roots together.
+        return self.build_graph_from_roots(
+            root_paper_ids, iterations, top_cited_limit, top_references_limit
+        )
     
     def get_graph_data(self) -> Dict[str, Any]:
         """
@@ -364,50 +584,186 @@ class GraphService:
                 }
             }
         
-        # Calculate layout with fewer iterations for speed
-        pos = nx.spring_layout(self.graph, k=2, iterations=20)
+        if self._graph_data_cache and self._graph_data_cache[0] == self._graph_version:
+            # Shallow copy so callers adding top-level keys don't touch the cache
+            return dict(self._graph_data_cache[1])
+        
+        # Layout rows follow the CSR node order, which is the graph's node order;
+        # one tolist() turns them into plain floats instead of per-node lookups
+        coords = np.asarray(list(self._compute_layout().values())).tolist()
         
         # Build nodes and edges efficiently
-        nodes = [
-            {
+        nodes = []
+        for (node_id, data), (x, y) in zip(self.graph.nodes(data=True), coords):
+            paper = data['paper']
+            nodes.append({
                 'id': node_id,
-                'title': data.get('title', 'Untitled'),
-                'authors': data.get('authors', []),
-                'year': data.get('year'),
-                'citations': data.get('citations', 0),
-                'abstract': data.get('abstract', ''),
-                'topics': data.get('topics', []),
+                'title': paper.title,
+                'authors': paper.authors,
+                'year': paper.year,
+                'citations': paper.citations,
+                'abstract': paper.abstract,
+                'topics': paper.topics,
                 'is_root': data.get('is_root', False),
-                'x': pos[node_id][0],
-                'y': pos[node_id][1]
-            }
-            for node_id, data in self.graph.nodes(data=True)
-        ]
+                'x': x,
+                'y': y
+            })
         
         edges = [
             {'source': source, 'target': target}
             for source, target in self.graph.edges()
         ]
         
-        # Calculate metadata
-        try:
-            is_connected = nx.is_weakly_connected(self.graph)
-        except Exception:
-            is_connected = False
+        # Calculate metadata; one weak-components pass gives both values
+        num_components = self._get_num_components()
         
         metadata = {
             'total_nodes': len(nodes),
             'total_edges': len(edges),
-            'is_connected': is_connected,
-            'num_components': nx.number_weakly_connected_components(self.graph),
+            'is_connected': num_components == 1,
+            'num_components': num_components,
             'generated_at': datetime.now().isoformat()
         }
         
-        return {
+        result = {
             'nodes': nodes,
             'edges': edges,
             'metadata': metadata
         }
+        self._graph_data_cache = (self._graph_version, result)
+        return dict(result)
+    
+    def get_graph_columns(self) -> Dict[str, Any]:
+        """
+        Get the current graph data as columns instead of per-node dictionaries.
+        
+        Returns:
+            Dictionary with 'nodes' and 'edges' as dicts of equal-length lists
+        """
+        coords = np.asarray(list(self._compute_layout().values())).tolist() if self.graph.nodes() else []
+        
+        node_ids = list(self.graph.nodes())
+        papers = [paper for _, paper in self.graph.nodes(data='paper')]
+        nodes = {
+            'id': node_ids,
+            'title': [paper.title for paper in papers],
+            'authors': [paper.authors for paper in papers],
+            'year': [paper.year for paper in papers],
+            'citations': [paper.citations for paper in papers],
+            'abstract': [paper.abstract for paper in papers],
+            'topics': [paper.topics for paper in papers],
+            'x': [x for x, _ in coords],
+            'y': [y for _, y in coords]
+        }
+        
+        sources, targets = [], []
+        for source, target in self.graph.edges():
+            sources.append(source)
+            targets.append(target)
+        
+        return {
+            'nodes': nodes,
+            'edges': {'source': sources, 'target': targets},
+            'metadata': {
+                'total_nodes': len(node_ids),
+                'total_edges': len(sources),
+                'generated_at': datetime.now().isoformat()
+            }
+        }
+    
+    def _compute_layout(self) -> Dict[str, Any]:
+        """Calculate node positions for the current graph, reusing them until it changes."""
+        if self._layout is not None:
+            return self._layout
+        
+        try:
+            ig_graph = self._get_igraph()
+        except ImportError:
+            # Same force model in numpy when igraph isn't installed; fewer iterations for speed
+            coords = _fruchterman_reingold(self._get_csr(), iterations=20, k=2)
+        else:
+            coords = np.asarray(ig_graph.layout_fruchterman_reingold(niter=20).coords, dtype=float)
+        
+        # Rescale to [-1, 1] around the origin, matching nx.spring_layout
+        coords -= coords.mean(axis=0)
+        limit = np.abs(coords).max()
+        if limit > 0:
+            coords /= limit
+        self._layout = dict(zip(self._csr_nodes, coords))
+        return self._layout
+    
+    def get_graph_tables(self) -> Dict[str, Any]:
+        """
+        Get the current graph as columnar Arrow tables.
+        
+        Returns:
+            Dictionary with 'nodes' and 'edges' pyarrow Tables
+        """
+        import pyarrow as pa
+        
+        if self.graph.nodes():
+            coords = np.asarray(list(self._compute_layout().values()), dtype=float)
+            in_degs, out_degs = self._get_degrees()
+            # Node order matches the CSR snapshot the layout and degree arrays were taken from
+            node_ids = self._csr_nodes
+        else:
+            coords = np.empty((0, 2))
+            in_degs, out_degs = [], []
+            node_ids = []
+        xs, ys = coords[:, 0], coords[:, 1]
+        
+        ids, titles, years, citations = [], [], [], []
+        for node_id in node_ids:
+            paper = self.graph.nodes[node_id]['paper']
+            ids.append(node_id)
+            titles.append(paper.title)
+            years.append(paper.year)
+            citations.append(paper.citations)
+        
+        nodes = pa.Table.from_arrays(
+            [
+                pa.array(ids, type=pa.string()),
+                pa.array(titles, type=pa.string()),
+                pa.array(years, type=pa.int32()),
+                pa.array(citations, type=pa.int64()),
+                pa.array(xs, type=pa.float64()),
+                pa.array(ys, type=pa.float64()),
+                pa.array(in_degs, type=pa.int32()),
+                pa.array(out_degs, type=pa.int32())
+            ],
+            names=['id', 'title', 'year', 'citations', 'x', 'y', 'in_degree', 'out_degree']
+        )
+        
+        sources, targets = [], []
+        for source, target in self.graph.edges():
+            sources.append(source)
+            targets.append(target)
+        
+        edges = pa.Table.from_arrays(
+            [pa.array(sources, type=pa.string()), pa.array(targets, type=pa.string())],
+            names=['source', 'target']
+        )
+        
+        return {'nodes': nodes, 'edges': edges}
+    
+    def export_graph_arrow(self, table: str = 'nodes') -> bytes:
+        """
+        Serialize one of the graph tables as an Arrow IPC stream.
+        
+        Args:
+            table: Which table to export ('nodes' or 'edges')
+            
+        Returns:
+            Arrow IPC stream bytes
+        """
+        import pyarrow as pa
+        
+        arrow_table = self.get_graph_tables()[table]
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, arrow_table.schema) as writer:
+            for batch in arrow_table.to_batches():
+                writer.write_batch(batch)
+        return sink.getvalue().to_pybytes()
     
     def get_paper_neighbors(self, paper_id: str) -> Dict[str, Any]:
         """
@@ -423,27 +779,15 @@ class GraphService:
         if not is_valid or normalized_id not in self.graph:
             return {'error': 'Paper not in graph'}
         
-        citing = []
-        for source in self.graph.predecessors(normalized_id):
-            data = self.graph.nodes[source]
-            citing.append({
-                'id': source,
-                'title': data.get('title', 'Untitled'),
-                'authors': data.get('authors', []),
-                'year': data.get('year'),
-                'citations': data.get('citations', 0)
-            })
-        
-        references = []
-        for target in self.graph.successors(normalized_id):
-            data = self.graph.nodes[target]
-            references.append({
-                'id': target,
-                'title': data.get('title', 'Untitled'),
-                'authors': data.get('authors', []),
-                'year': data.get('year'),
-                'citations': data.get('citations', 0)
-            })
+        nodes = self.graph.nodes
+        citing = [
+            _neighbor_summary(source, nodes[source]['paper'])
+            for source in self.graph.pred[normalized_id]
+        ]
+        references = [
+            _neighbor_summary(target, nodes[target]['paper'])
+            for target in self.graph.succ[normalized_id]
+        ]
         
         return {
             'paper_id': normalized_id,
@@ -463,30 +807,51 @@ class GraphService:
         if not self.graph.nodes():
             return {'error': 'No graph built yet'}
         
+        if self._graph_stats_cache and self._graph_stats_cache[0] == self._graph_version:
+            return dict(self._graph_stats_cache[1])
+        
+        # Degrees and components from one pass over the CSR adjacency
+        csr = self._get_csr()
+        num_nodes = csr.shape[0]
+        num_edges = int(csr.nnz)
+        in_degrees, out_degrees = self._get_degrees()
+        degrees = in_degrees + out_degrees
+        num_components = self._get_num_components()
+        
         stats = {
-            'total_papers': len(self.graph.nodes()),
-            'total_citations': len(self.graph.edges()),
-            'density': nx.density(self.graph),
-            'is_connected': nx.is_weakly_connected(self.graph),
-            'average_degree': sum(dict(self.graph.degree()).values()) / len(self.graph.nodes()) if self.graph.nodes() else 0,
-            'max_degree': max(dict(self.graph.degree()).values()) if self.graph.nodes() else 0,
-            'components': nx.number_weakly_connected_components(self.graph)
+            'total_papers': num_nodes,
+            'total_citations': num_edges,
+            'density': num_edges / (num_nodes * (num_nodes - 1)) if num_nodes > 1 else 0,
+            'is_connected': num_components == 1,
+            'average_degree': 2 * num_edges / num_nodes,
+            'max_degree': int(degrees.max()),
+            'components': num_components
         }
         
-        # Get top papers by citation count
-        papers_with_citations = []
-        for node_id, data in self.graph.nodes(data=True):
-            papers_with_citations.append({
-                'id': node_id,
-                'title': data.get('title', 'Untitled'),
-                'citations': data.get('citations', 0),
-                'year': data.get('year')
+        # Get top papers by citation count (partial selection, ties keep node order)
+        node_ids = self._csr_nodes
+        node_papers = self.graph.nodes(data='paper')
+        citations = np.fromiter(
+            (node_papers[node_id].citations for node_id in node_ids),
+            dtype=np.float64, count=num_nodes
+        )
+        top_count = min(10, num_nodes)
+        threshold = citations[np.argpartition(-citations, top_count - 1)[:top_count]].min()
+        candidates = np.flatnonzero(citations >= threshold)
+        top_indices = candidates[np.argsort(-citations[candidates], kind='stable')][:top_count]
+        
+        stats['top_papers'] = []
+        for index in top_indices:
+            paper = node_papers[node_ids[index]]
+            stats['top_papers'].append({
+                'id': node_ids[index],
+                'title': paper.title,
+                'citations': paper.citations,
+                'year': paper.year
             })
         
-        papers_with_citations.sort(key=lambda x: x['citations'], reverse=True)
-        stats['top_papers'] = papers_with_citations[:10]
-        
-        return stats
+        self._graph_stats_cache = (self._graph_version, stats)
+        return dict(stats)
     
     def add_source_node(self, paper_id: str, expand_from_node: bool = False, 
                        iterations: int = 2, top_cited_limit: int = 3, 
@@ -508,7 +873,7 @@ class GraphService:
         if not is_valid:
             return {'error': 'Invalid paper ID'}
         
-        if normalized_id in self.added_papers:
+        if normalized_id in self._papers:
             return {'error': 'Paper already exists in graph'}
         
         # Add the paper to the graph
@@ -557,33 +922,51 @@ class GraphService:
         
         initial_paper_count = len(self.graph.nodes())
         current_level = [normalized_id]
+        # Nodes and edges for the whole expansion, inserted once after the loop
+        pending_nodes = []
+        pending_edges = []
         
         for iteration in range(iterations):
+            # One combined citations/references call for the whole level
+            combined_data = self.openalex_service.get_citations_and_references_batch(
+                current_level,
+                cited_per_page=min(200, top_cited_limit * 3),
+                ref_per_page=min(200, top_references_limit * 3)
+            )
+            targets = self._level_targets(current_level, combined_data, top_cited_limit, top_references_limit)
+            
+            # Batch fetch every candidate paper for this level at once
+            candidate_ids = []
+            for citing_ids, reference_ids in targets.values():
+                candidate_ids.extend(citing_ids)
+                candidate_ids.extend(reference_ids)
+            self._prefetch_papers(candidate_ids)
+            
             next_level = []
             
-            for node_id in current_level:
-                # Get citing papers
-                citing_papers = self.openalex_service.get_top_cited_papers(
-                    node_id, top_cited_limit
-                )
-                for paper in citing_papers:
-                    if self.add_paper_to_graph(paper.id):
-                        self.graph.add_edge(paper.id, node_id)
-                        next_level.append(paper.id)
+            for node_id, (citing_ids, reference_ids) in targets.items():
+                for citing_id in citing_ids:
+                    node = self._claim_paper(citing_id)
+                    if node:
+                        pending_nodes.append(node)
+                        pending_edges.append((node[0], node_id))
+                        next_level.append(node[0])
                 
-                # Get reference papers
-                reference_papers = self.openalex_service.get_top_reference_papers(
-                    node_id, top_references_limit
-                )
-                for paper in reference_papers:
-                    if self.add_paper_to_graph(paper.id):
-                        self.graph.add_edge(node_id, paper.id)
-                        next_level.append(paper.id)
+                for ref_id in reference_ids:
+                    node = self._claim_paper(ref_id)
+                    if node:
+                        pending_nodes.append(node)
+                        pending_edges.append((node_id, node[0]))
+                        next_level.append(node[0])
             
             current_level = next_level
             if not current_level:
                 break
         
+        self.graph.add_nodes_from(pending_nodes)
+        self.graph.add_edges_from(pending_edges)
+        self._mark_dirty()
+        
         final_paper_count = len(self.graph.nodes())
         new_papers_added = final_paper_count - initial_paper_count
         
@@ -614,10 +997,8 @@ class GraphService:
         if normalized_id not in self.graph:
             return {'error': 'Paper not found in graph'}
         
-        # Get connected nodes before removal
-        connected_nodes = set()
-        for edge in self.graph.edges(normalized_id):
-            connected_nodes.update(edge)
+        # Get connected nodes (citing and referenced) before removal
+        connected_nodes = self.graph.pred[normalized_id].keys() | self.graph.succ[normalized_id].keys()
         
         # Remove the node
         if not self.remove_paper_from_graph(paper_id):
@@ -632,11 +1013,12 @@ class GraphService:
         
         # Optionally remove orphaned nodes
         if remove_orphaned:
-            orphaned_nodes = []
-            for node_id in list(self.graph.nodes()):
-                if self.graph.degree(node_id) == 0:
-                    orphaned_nodes.append(node_id)
-                    self.remove_paper_from_graph(node_id)
+            orphaned_nodes = list(nx.isolates(self.graph))
+            if orphaned_nodes:
+                self.graph.remove_nodes_from(orphaned_nodes)
+                self._mark_dirty()
+                for node_id in orphaned_nodes:
+                    self._forget_paper(node_id)
             
             result['orphaned_nodes_removed'] = orphaned_nodes
             result['orphaned_count'] = len(orphaned_nodes)
@@ -660,24 +1042,26 @@ class GraphService:
         if normalized_id not in self.graph:
             return {'error': 'Paper not found in graph'}
         
-        node_data = self.graph.nodes[normalized_id]
-        neighbors = self.get_paper_neighbors(paper_id)
+        node_data = self.graph.nodes[normalized_id]['paper'].to_dict()
+        neighbors = self.get_paper_neighbors(normalized_id)
         
         return {
             'paper_id': normalized_id,
             'node_data': node_data,
             'neighbors': neighbors,
-            'degree': self.graph.degree(normalized_id),
-            'in_degree': self.graph.in_degree(normalized_id),
-            'out_degree': self.graph.out_degree(normalized_id)
+            'degree': neighbors['total_citing'] + neighbors['total_referenced'],
+            'in_degree': neighbors['total_citing'],
+            'out_degree': neighbors['total_referenced']
         }
     
     def clear_graph(self) -> Dict[str, Any]:
         """Clear the current graph and return confirmation."""
         initial_count = len(self.graph.nodes())
         self.graph.clear()
-        self.added_papers.clear()
-        self.openalex_service.paper_cache.clear()
+        self._mark_dirty()
+        self._papers.clear()
+        # The OpenAlex service cache is shared process-wide; leave it to its LRU policy
+        self.paper_cache.clear()
         
         return {
             'message': 'Graph cleared successfully',
@@ -1,39 +1,234 @@
 """Service for interacting with OpenAlex API."""
 
 from typing import Dict, List, Optional, Any
+import heapq
 import requests
 import json
-import time
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from ..models.paper import Paper, PaperFormatter
+from ..utils.cache import LRUCache
+from ..utils.circuit_breaker import CircuitBreaker, CircuitOpenError
 from ..utils.rate_limiter import RateLimiter
 from ..utils.validators import validate_paper_id
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    orjson = None
+
+try:
+    import diskcache
+except ImportError:  # diskcache is optional; only needed for the persistent cache
+    diskcache = None
+
+logger = logging.getLogger(__name__)
+
+OPENALEX_PREFIX = 'https://openalex.org/'
+# OpenAlex caps the number of OR-ed values in one filter
+FILTER_CHUNK_SIZE = 50
+# Concurrent OpenAlex requests per batch call (the shared RateLimiter still paces them)
+MAX_FETCH_WORKERS = 8
+# (connect, read) timeout in seconds so a stalled connection can't hold a pool slot forever
+REQUEST_TIMEOUT = (5.0, 30.0)
+# OpenAlex data changes on the scale of days, so persisted entries expire after a week
+DISK_CACHE_EXPIRE = 7 * 86400
+DISK_CACHE_SIZE_LIMIT = 2 ** 30
+# Work fields read by PaperFormatter.format_paper_data; requested via `select`
+# so OpenAlex omits large unused fields such as abstract_inverted_index
+PAPER_SELECT_FIELDS = ','.join([
+    'id', 'doi', 'title', 'display_name', 'publication_year', 'publication_date',
+    'authorships', 'concepts', 'cited_by_count', 'primary_location', 'type',
+    'language', 'open_access', 'referenced_works', 'related_works'
+])
+# Work fields needed to map citation/reference links between papers
+LINK_SELECT_FIELDS = 'id,referenced_works'
+
+
+def _decode_json(response: requests.Response) -> Any:
+    """Decode a JSON response body, parsing the raw bytes with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
 
 class OpenAlexService:
     """Service for interacting with OpenAlex API."""
     
-    def __init__(self, rate_limit_delay: float = 0.1, mailto: str = "dchayapathy3@gatech.edu"):
+    def __init__(self, rate_limit_delay: float = 0.1, mailto: str = "dchayapathy3@gatech.edu",
+                 pool_size: int = 32, max_retries: int = 3, cache_size: int = 50_000,
+                 rate_limit_burst: int = 5, breaker_threshold: int = 5,
+                 breaker_reset_timeout: float = 30.0, disk_cache_dir: Optional[str] = None):
         """
         Initialize OpenAlex service.
         
         Args:
             rate_limit_delay: Delay between API calls in seconds
             mailto: Email address for polite polling (required by OpenAlex)
+            pool_size: Number of keep-alive connections kept open to OpenAlex
+            max_retries: Transport-level retries for connection errors and 429/5xx responses
+            cache_size: Maximum number of papers kept in the paper cache
+            rate_limit_burst: Calls allowed back to back before rate_limit_delay spacing applies
+            breaker_threshold: Consecutive failed requests that pause all OpenAlex calls
+            breaker_reset_timeout: Seconds to pause OpenAlex calls once the breaker opens
+            disk_cache_dir: Directory for a persistent paper/reference cache shared
+                across runs (requires diskcache); disabled when None
         """
         self.base_url = "https://api.openalex.org"
         self.mailto = mailto
-        self.rate_limiter = RateLimiter(delay=rate_limit_delay)
-        self.paper_cache: Dict[str, Paper] = {}
+        self.rate_limiter = RateLimiter(delay=rate_limit_delay, burst=rate_limit_burst)
+        self.paper_cache: Dict[str, Paper] = LRUCache(maxsize=cache_size)
+        # Reference IDs harvested from every Work payload, keyed like paper_cache
+        self.references_cache: Dict[str, List[str]] = LRUCache(maxsize=cache_size)
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=breaker_threshold, reset_timeout=breaker_reset_timeout
+        )
+        self.disk_cache = None
+        if disk_cache_dir:
+            if diskcache is None:
+                logger.warning("diskcache is not installed; persistent cache at %s disabled", disk_cache_dir)
+            else:
+                self.disk_cache = diskcache.Cache(disk_cache_dir, size_limit=DISK_CACHE_SIZE_LIMIT)
+        
+        # One pooled session so every call reuses warm TCP/TLS connections
         self.session = requests.Session()
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=0.5,
+            backoff_jitter=0.3,  # Spread retries from concurrent workers apart
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['GET'],
+            respect_retry_after_header=True,  # Honour OpenAlex's Retry-After on 429s
+            raise_on_status=False  # Hand the final response back so raise_for_status() still applies
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('https://', adapter)
         self.session.headers.update({
             'User-Agent': f'RefNet/1.0 (https://github.com/your-repo/refnet; mailto:{mailto})',
-            'Accept': 'application/json'
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip'
         })
     
+    @staticmethod
+    def _normalize_id(paper_id: str) -> str:
+        """
+        Normalize a paper ID to its OpenAlex or DOI URL.
+        
+        Args:
+            paper_id: Paper ID (OpenAlex ID, OpenAlex URL or DOI)
+            
+        Returns:
+            Normalized URL, or an empty string if the ID is invalid
+        """
+        return validate_paper_id(paper_id)[1]
+    
+    @staticmethod
+    def _openalex_targets(paper_ids: List[str]) -> Dict[str, str]:
+        """
+        Map OpenAlex URLs usable in batch filters back to the input IDs.
+        
+        Empty, invalid and DOI inputs are dropped.
+        
+        Args:
+            paper_ids: List of paper IDs
+            
+        Returns:
+            Dictionary mapping normalized OpenAlex URL to the original paper ID
+        """
+        # Skip empty IDs before validation, and DOIs, which an openalex:/cites:
+        # filter can't match and would otherwise poison the whole request
+        return {
+            normalized_id: paper_id
+            for paper_id in paper_ids if paper_id
+            for is_valid, normalized_id in (validate_paper_id(paper_id),)
+            if is_valid and normalized_id.startswith(OPENALEX_PREFIX)
+        }
+    
+    def _get_cached_paper(self, paper_id: str) -> Optional[Paper]:
+        """
+        Look up a paper in the memory cache, then in the disk cache.
+        
+        Args:
+            paper_id: Normalized paper ID
+            
+        Returns:
+            Cached Paper object or None
+        """
+        paper = self.paper_cache.get(paper_id)
+        if paper is not None:
+            return paper
+        if self.disk_cache is not None:
+            paper = self.disk_cache.get(paper_id)
+            if paper is not None:
+                self.paper_cache[paper_id] = paper
+                return paper
+        return None
+    
+    def _cache_paper(self, paper_id: str, paper: Paper) -> None:
+        """Store a paper in the memory cache and, if enabled, the disk cache."""
+        self.paper_cache[paper_id] = paper
+        if self.disk_cache is not None:
+            self.disk_cache.set(paper_id, paper, expire=DISK_CACHE_EXPIRE)
+    
+    def _get_cached_references(self, paper_id: str) -> Optional[List[str]]:
+        """
+        Look up a paper's reference IDs in the memory cache, then in the disk cache.
+        
+        Args:
+            paper_id: Normalized paper ID
+            
+        Returns:
+            Cached list of reference IDs or None
+        """
+        reference_ids = self.references_cache.get(paper_id)
+        if reference_ids is not None:
+            return reference_ids
+        if self.disk_cache is not None:
+            reference_ids = self.disk_cache.get(f"refs:{paper_id}")
+            if reference_ids is not None:
+                self.references_cache[paper_id] = reference_ids
+                return reference_ids
+        return None
+    
+    def _cache_references(self, paper_id: str, reference_ids: List[str]) -> None:
+        """Store reference IDs in the memory cache and, if enabled, the disk cache."""
+        self.references_cache[paper_id] = reference_ids
+        if self.disk_cache is not None:
+            self.disk_cache.set(f"refs:{paper_id}", reference_ids, expire=DISK_CACHE_EXPIRE)
+    
+    def _remember_references(self, raw_paper: Dict[str, Any]) -> Optional[List[str]]:
+        """
+        Cache the reference IDs carried in a raw OpenAlex Work.
+        
+        Args:
+            raw_paper: Raw Work data from OpenAlex
+            
+        Returns:
+            List of reference IDs, or None if the Work has no referenced_works list
+        """
+        references = raw_paper.get('referenced_works')
+        if not isinstance(references, list):
+            return None
+        
+        # Extract just the paper ID from the full OpenAlex URL (non-URLs pass through)
+        reference_ids = [ref_url.rpartition('openalex.org/')[2] for ref_url in references if ref_url]
+        
+        work_id = raw_paper.get('id')
+        if work_id:
+            self._cache_references(work_id, reference_ids)
+        return reference_ids
+    
     def search_papers(self, query: str, page: int = 1, per_page: int = 25, 
                      sort_by: str = 'cited_by_count') -> Optional[Dict[str, Any]]:
         """
-        Search for papers using OpenAlex API with retry logic.
+        Search for papers using OpenAlex API.
+        
+        Transient failures (429/5xx, connection errors) are retried by the
+        session's transport adapter.
         
         Args:
             query: Search query
@@ -44,61 +239,45 @@ class OpenAlexService:
         Returns:
             Search results or None if failed
         """
-        max_retries = 3
-        retry_delay = 2  # seconds
-        
-        for attempt in range(max_retries + 1):
-            try:
-                self.rate_limiter.wait_if_needed()
-                
-                # Build URL
-                url = f"{self.base_url}/works"
-                params = {
-                    'search': query,  # Use general search instead of title filter
-                    'page': page,
-                    'per-page': min(per_page, 200),  # OpenAlex max is 200
-                    'sort': f'{sort_by}:desc',
-                    'mailto': self.mailto
+        try:
+            self.rate_limiter.wait_if_needed()
+            
+            # Build URL
+            url = f"{self.base_url}/works"
+            params = {
+                'search': query,  # Use general search instead of title filter
+                'page': page,
+                'per-page': min(per_page, 200),  # OpenAlex max is 200
+                'sort': f'{sort_by}:desc',
+                'select': PAPER_SELECT_FIELDS,
+                'mailto': self.mailto
+            }
+            
+            logger.debug("Searching papers: %s", query)
+            response = self._request(url, params)
+            
+            data = _decode_json(response)
+            
+            if 'results' in data:
+                logger.debug("Found %d papers", len(data['results']))
+                return {
+                    'results': data['results'],
+                    'meta': data.get('meta', {})
                 }
-                
-                print(f"🔍 Attempt {attempt + 1}: Searching papers: {query}")
-                response = self.session.get(url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                if 'results' in data:
-                    print(f"✅ Found {len(data['results'])} papers")
-                    return {
-                        'results': data['results'],
-                        'meta': data.get('meta', {})
-                    }
-                
-                return None
             
-            except Exception as e:
-                print(f"❌ Attempt {attempt + 1} failed: {e}")
-                
-                # Check if it's a retryable error
-                if attempt < max_retries and (
-                    (hasattr(e, 'response') and e.response and e.response.status_code in [503, 502, 504, 429]) or
-                    'timeout' in str(e).lower() or
-                    'connection' in str(e).lower()
-                ):
-                    wait_time = retry_delay * (2 ** attempt)  # Exponential backoff
-                    print(f"⏳ Waiting {wait_time}s before retry...")
-                    time.sleep(wait_time)
-                else:
-                    print(f"💥 All {max_retries + 1} attempts failed")
-                    # Return mock data as fallback when OpenAlex is completely down
-                    return self._get_mock_search_results(query, page, per_page)
+            return None
+        
+        except Exception as e:
+            logger.warning("Search failed: %s", e)
+            # Return mock data as fallback when OpenAlex is completely down
+            return self._get_mock_search_results(query, page, per_page)
     
     def _get_mock_search_results(self, query: str, page: int, per_page: int) -> Dict[str, Any]:
         """
         Generate mock search results when OpenAlex API is unavailable.
         This allows the app to function for testing purposes.
         """
-        print(f"🔄 Using mock data for query: {query}")
+        logger.warning("Using mock data for query: %s", query)
         
         # Generate mock papers based on the query
         mock_papers = []
@@ -122,7 +301,8 @@ class OpenAlexService:
                     }
                 },
                 'doi': f'10.1000/mock.{i+1}',
-                'type': 'journal-article'
+                'type': 'journal-article',
+                'is_mock': True  # Keeps format_raw_paper_data from caching it
             }
             mock_papers.append(mock_paper)
         
@@ -139,6 +319,10 @@ class OpenAlexService:
         Format raw paper data from search results into a Paper object.
         This is much faster than making individual API calls.
         
+        A Work that is already cached is returned without being formatted again;
+        newly formatted papers are added to the cache. Mock Works from
+        _get_mock_search_results are formatted but never cached.
+        
         Args:
             raw_paper: Raw paper data from search results
             
@@ -146,9 +330,22 @@ class OpenAlexService:
             Paper object or None if invalid
         """
         try:
-            return PaperFormatter.format_paper_data(raw_paper)
+            if raw_paper.get('is_mock'):
+                return PaperFormatter.format_paper_data(raw_paper)
+            
+            work_id = raw_paper.get('id')
+            if work_id:
+                cached = self._get_cached_paper(work_id)
+                if cached is not None:
+                    return cached
+            
+            self._remember_references(raw_paper)
+            paper = PaperFormatter.format_paper_data(raw_paper)
+            if paper and paper.id:
+                self._cache_paper(paper.id, paper)
+            return paper
         except Exception as e:
-            print(f"❌ Failed to format raw paper data: {e}")
+            logger.warning("Failed to format raw paper data: %s", e)
             return None
     
     def get_paper_by_id(self, paper_id: str) -> Optional[Paper]:
@@ -161,123 +358,94 @@ class OpenAlexService:
         Returns:
             Paper object or None if not found
         """
-        # Normalize paper ID
-        if paper_id.startswith('10.'):
-            normalized_id = f"https://doi.org/{paper_id}"
-        elif not paper_id.startswith('https://openalex.org/'):
-            normalized_id = f"https://openalex.org/{paper_id}"
-        else:
-            normalized_id = paper_id
+        # Normalize paper ID (same canonical key the graph service uses)
+        is_valid, normalized_id = validate_paper_id(paper_id)
+        if not is_valid:
+            return None
         
         # Check cache first
-        if normalized_id in self.paper_cache:
-            return self.paper_cache[normalized_id]
+        cached = self._get_cached_paper(normalized_id)
+        if cached is not None:
+            return cached
         
-        # Add retry logic with requests
-        import time
-        max_retries = 3
-        
-        for attempt in range(max_retries + 1):
-            try:
-                self.rate_limiter.wait_if_needed()
-                print(f"🔍 Attempt {attempt + 1}: Getting paper {normalized_id}")
-                
-                # Use requests instead of pyalex
-                url = f"{self.base_url}/works/{normalized_id}"
-                params = {'mailto': self.mailto}
-                response = self.session.get(url, params=params)
-                response.raise_for_status()
-                
-                raw_paper = response.json()
-                
-                if raw_paper:
-                    paper = PaperFormatter.format_paper_data(raw_paper)
-                    if paper:
-                        print(f"✅ Success: Found paper '{paper.title[:50]}...'")
-                        self.paper_cache[normalized_id] = paper
-                        return paper
-                    else:
-                        print(f"⚠️  Attempt {attempt + 1}: Paper data invalid")
-                else:
-                    print(f"⚠️  Attempt {attempt + 1}: Paper not found")
-                
-                return None
-                    
-            except Exception as e:
-                print(f"❌ Attempt {attempt + 1} failed: {e}")
-                if attempt < max_retries:
-                    wait_time = 2 ** attempt  # Exponential backoff
-                    print(f"⏳ Waiting {wait_time}s before retry...")
-                    time.sleep(wait_time)
+        try:
+            self.rate_limiter.wait_if_needed()
+            logger.debug("Getting paper %s", normalized_id)
+            
+            url = f"{self.base_url}/works/{normalized_id}"
+            params = {'select': PAPER_SELECT_FIELDS, 'mailto': self.mailto}
+            response = self._request(url, params)
+            
+            raw_paper = _decode_json(response)
+            
+            if raw_paper:
+                self._remember_references(raw_paper)
+                paper = PaperFormatter.format_paper_data(raw_paper)
+                if paper:
+                    logger.debug("Found paper %s", normalized_id)
+                    self._cache_paper(normalized_id, paper)
+                    if paper.id != normalized_id:
+                        # DOI lookup: also key by the OpenAlex ID batch calls use
+                        self._cache_paper(paper.id, paper)
+                    return paper
                 else:
-                    print(f"💥 All {max_retries + 1} attempts failed")
+                    logger.warning("Paper data invalid: %s", normalized_id)
+            else:
+                logger.debug("Paper not found: %s", normalized_id)
+        
+        except Exception as e:
+            logger.warning("Failed to get paper %s: %s", normalized_id, e)
         
         return None
     
     def get_citing_papers(self, paper_id: str, page: int = 1, 
-                         per_page: int = 25, max_retries: int = 3) -> Optional[Dict[str, Any]]:
+                         per_page: int = 25) -> Optional[Dict[str, Any]]:
         """
-        Get papers that cite the given paper with retry logic.
+        Get papers that cite the given paper.
         
         Args:
             paper_id: Paper ID
             page: Page number
             per_page: Results per page
-            max_retries: Maximum number of retry attempts
             
         Returns:
             Citing papers or None if failed
         """
-        import time
-        
-        for attempt in range(max_retries + 1):
-            try:
-                self.rate_limiter.wait_if_needed()
-                
-                # Normalize paper ID
-                if paper_id.startswith('10.'):
-                    normalized_id = f"https://doi.org/{paper_id}"
-                elif not paper_id.startswith('https://openalex.org/'):
-                    normalized_id = f"https://openalex.org/{paper_id}"
-                else:
-                    normalized_id = paper_id
-                
-                print(f"🔍 Attempt {attempt + 1}: Getting citations for {normalized_id}")
-                
-                # Use requests instead of pyalex
-                url = f"{self.base_url}/works"
-                params = {
-                    'filter': f'cites:{normalized_id}',
-                    'sort': 'cited_by_count:desc',
-                    'per-page': min(per_page, 200),
-                    'page': page,
-                    'mailto': self.mailto
+        try:
+            self.rate_limiter.wait_if_needed()
+            
+            normalized_id = self._normalize_id(paper_id)
+            if not normalized_id:
+                return None
+            
+            logger.debug("Getting citations for %s", normalized_id)
+            
+            url = f"{self.base_url}/works"
+            params = {
+                'filter': f'cites:{normalized_id}',
+                'sort': 'cited_by_count:desc',
+                'per-page': min(per_page, 200),
+                'page': page,
+                'select': PAPER_SELECT_FIELDS,
+                'mailto': self.mailto
+            }
+            
+            response = self._request(url, params)
+            
+            data = _decode_json(response)
+            results = data.get('results', [])
+            meta = data.get('meta', {})
+            
+            if results is not None:
+                logger.debug("Found %d citations", len(results))
+                return {
+                    'results': results,
+                    'meta': meta
                 }
-                
-                response = self.session.get(url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                results = data.get('results', [])
-                meta = data.get('meta', {})
-                
-                if results is not None:
-                    print(f"✅ Success: Found {len(results)} citations")
-                    return {
-                        'results': results,
-                        'meta': meta
-                    }
-                else:
-                    print(f"⚠️  Attempt {attempt + 1}: No results returned")
-                    
-            except Exception as e:
-                print(f"❌ Attempt {attempt + 1} failed: {e}")
-                if attempt < max_retries:
-                    wait_time = 2 ** attempt  # Exponential backoff
-                    print(f"⏳ Waiting {wait_time}s before retry...")
-                    time.sleep(wait_time)
-                else:
-                    print(f"💥 All {max_retries + 1} attempts failed")
+            logger.debug("No citations returned for %s", normalized_id)
+        
+        except Exception as e:
+            logger.warning("Failed to get citations for %s: %s", paper_id, e)
         
         return None
     
@@ -291,57 +459,38 @@ class OpenAlexService:
         Returns:
             List of reference IDs or None if failed
         """
+        normalized_id = self._normalize_id(paper_id)
+        if not normalized_id:
+            return []
+        
+        # Reuse referenced_works already seen in an earlier Work payload
+        cached = self._get_cached_references(normalized_id)
+        if cached is not None:
+            return cached
+        
         # Don't call get_paper_by_id here to avoid recursion
         # We'll get the paper data directly
+        try:
+            self.rate_limiter.wait_if_needed()
+            
+            logger.debug("Getting references for %s", normalized_id)
+            
+            url = f"{self.base_url}/works/{normalized_id}"
+            params = {'select': LINK_SELECT_FIELDS, 'mailto': self.mailto}
+            response = self._request(url, params)
+            
+            raw_paper = _decode_json(response)
+            reference_ids = self._remember_references(raw_paper) if raw_paper else None
+            if reference_ids is not None:
+                self._cache_references(normalized_id, reference_ids)
+                logger.debug("Found %d references", len(reference_ids))
+                return reference_ids
+            else:
+                logger.debug("No references found for %s", normalized_id)
+                return []
         
-        # Get raw paper data to access referenced_works with retry logic
-        import time
-        max_retries = 3
-        
-        for attempt in range(max_retries + 1):
-            try:
-                self.rate_limiter.wait_if_needed()
-                
-                if paper_id.startswith('10.'):
-                    normalized_id = f"https://doi.org/{paper_id}"
-                elif not paper_id.startswith('https://openalex.org/'):
-                    normalized_id = f"https://openalex.org/{paper_id}"
-                else:
-                    normalized_id = paper_id
-                
-                print(f"🔍 Attempt {attempt + 1}: Getting references for {normalized_id}")
-                
-                # Use requests instead of pyalex
-                url = f"{self.base_url}/works/{normalized_id}"
-                params = {'mailto': self.mailto}
-                response = self.session.get(url, params=params)
-                response.raise_for_status()
-                
-                raw_paper = response.json()
-                if raw_paper and isinstance(raw_paper.get('referenced_works'), list):
-                    references = raw_paper['referenced_works']
-                    # Extract just the paper ID from the full OpenAlex URL
-                    reference_ids = []
-                    for ref_url in references:
-                        if ref_url and 'openalex.org/' in ref_url:
-                            ref_id = ref_url.split('openalex.org/')[-1]
-                            reference_ids.append(ref_id)
-                        elif ref_url:
-                            reference_ids.append(ref_url)
-                    print(f"✅ Success: Found {len(reference_ids)} references")
-                    return reference_ids
-                else:
-                    print(f"⚠️  Attempt {attempt + 1}: No references found")
-                    return []
-                    
-            except Exception as e:
-                print(f"❌ Attempt {attempt + 1} failed: {e}")
-                if attempt < max_retries:
-                    wait_time = 2 ** attempt  # Exponential backoff
-                    print(f"⏳ Waiting {wait_time}s before retry...")
-                    time.sleep(wait_time)
-                else:
-                    print(f"💥 All {max_retries + 1} attempts failed")
+        except Exception as e:
+            logger.warning("Failed to get references for %s: %s", paper_id, e)
         
         return []
     
@@ -362,7 +511,7 @@ class OpenAlexService:
         
         papers = []
         for raw_paper in citing_data['results']:
-            paper = PaperFormatter.format_paper_data(raw_paper)
+            paper = self.format_raw_paper_data(raw_paper)
             if paper:
                 papers.append(paper)
         
@@ -383,20 +532,18 @@ class OpenAlexService:
         if not reference_ids:
             return []
         
-        papers = []
-        for ref_id in reference_ids[:limit * 2]:  # Get more than needed for sorting
-            if ref_id:
-                paper = self.get_paper_by_id(ref_id)
-                if paper:
-                    papers.append(paper)
+        # Get more than needed for sorting, in one batch request (cached papers are reused)
+        papers = self.get_papers_batch([ref_id for ref_id in reference_ids[:limit * 2] if ref_id])
         
-        # Sort by citation count and return top papers
-        papers.sort(key=lambda x: x.citations, reverse=True)
-        return papers[:limit]
+        # Select the most cited papers without sorting the whole batch
+        return heapq.nlargest(limit, papers, key=lambda x: x.citations)
     
     def get_papers_batch(self, paper_ids: List[str]) -> List[Paper]:
         """
-        Get multiple papers in a single API call using batch retrieval.
+        Get multiple papers using batch retrieval.
+        
+        Cached papers are returned directly; the rest are requested in
+        filter-sized chunks that run concurrently.
         
         Args:
             paper_ids: List of paper IDs to fetch
@@ -408,65 +555,93 @@ class OpenAlexService:
             return []
         
         try:
-            self.rate_limiter.wait_if_needed()
-            
             # Create filter for multiple OpenAlex IDs
             # Convert to proper OpenAlex format if needed
-            openalex_ids = []
-            for paper_id in paper_ids:
-                is_valid, normalized_id = validate_paper_id(paper_id)
-                if is_valid:
-                    if not normalized_id.startswith('https://openalex.org/'):
-                        normalized_id = f"https://openalex.org/{normalized_id}"
-                    openalex_ids.append(normalized_id)
+            openalex_ids = list(self._openalex_targets(paper_ids))
             
             if not openalex_ids:
                 return []
             
-            # Create filter string for batch retrieval
-            ids_filter = '|'.join(openalex_ids)
+            # Serve cached papers directly and only request the rest
+            papers = []
+            missing_ids = []
+            for openalex_id in openalex_ids:
+                cached = self._get_cached_paper(openalex_id)
+                if cached is not None:
+                    papers.append(cached)
+                else:
+                    missing_ids.append(openalex_id)
+            if not missing_ids:
+                return papers
+            
+            # OpenAlex matches at most FILTER_CHUNK_SIZE IDs per filter, so fetch
+            # the missing papers in chunks, concurrently over the pooled session
+            chunks = [
+                missing_ids[i:i + FILTER_CHUNK_SIZE]
+                for i in range(0, len(missing_ids), FILTER_CHUNK_SIZE)
+            ]
+            with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(chunks))) as executor:
+                for chunk_papers in executor.map(self._fetch_papers_chunk, chunks):
+                    papers.extend(chunk_papers)
+            
+            return papers
+        
+        except Exception as e:
+            logger.warning("Error in batch paper retrieval: %s", e)
+            return []
+    
+    def _fetch_papers_chunk(self, openalex_ids: List[str]) -> List[Paper]:
+        """
+        Fetch one filter-sized chunk of papers and add them to the cache.
+        
+        Args:
+            openalex_ids: At most FILTER_CHUNK_SIZE OpenAlex URLs
+            
+        Returns:
+            List of Paper objects
+        """
+        papers = []
+        try:
+            self.rate_limiter.wait_if_needed()
             
-            # Use requests instead of pyalex
             url = f"{self.base_url}/works"
             params = {
-                'filter': f'openalex:{ids_filter}',
-                'per-page': 50,  # Reduced batch size to avoid rate limits
+                'filter': f"openalex:{'|'.join(openalex_ids)}",
+                'per-page': len(openalex_ids),
+                'select': PAPER_SELECT_FIELDS,
                 'mailto': self.mailto
             }
             try:
-                response = self.session.get(url, params=params)
-                response.raise_for_status()
-                data = response.json()
-                response = data.get('results', [])
+                response = self._request(url, params)
+                results = _decode_json(response).get('results', [])
             except requests.exceptions.HTTPError as e:
                 if e.response.status_code == 429:
-                    print(f"⚠️  Rate limit hit in batch processing, reducing batch size...")
+                    logger.warning("Rate limit hit in batch processing, falling back to individual requests")
                     # Fall back to individual requests for smaller batches
-                    return self._get_papers_individually(paper_ids)
+                    return self._get_papers_individually(openalex_ids)
                 else:
                     raise
             
-            papers = []
-            if response:
-                for work_data in response:
+            if results:
+                for work_data in results:
+                    self._remember_references(work_data)
                     paper = PaperFormatter.format_paper_data(work_data)
                     if paper:
                         papers.append(paper)
                         # Cache the paper
-                        self.paper_cache[paper.id] = paper
-                        print(f"📄 Batch retrieved: '{paper.title[:30]}...' with {paper.citations} citations")
+                        self._cache_paper(paper.id, paper)
+                        logger.debug("Batch retrieved %s with %s citations", paper.id, paper.citations)
             else:
                 # Fallback to individual calls if batch fails
-                for paper_id in paper_ids:
+                for paper_id in openalex_ids:
                     paper = self.get_paper_by_id(paper_id)
                     if paper:
                         papers.append(paper)
-            
-            return papers
         
         except Exception as e:
-            print(f"Error in batch paper retrieval: {e}")
-            return []
+            logger.warning("Error in batch paper retrieval: %s", e)
+        
+        return papers
     
     def get_accurate_citation_count(self, paper_id: str) -> int:
         """
@@ -482,13 +657,9 @@ class OpenAlexService:
         try:
             self.rate_limiter.wait_if_needed()
             
-            # Normalize paper ID
-            if paper_id.startswith('10.'):
-                normalized_id = f"https://doi.org/{paper_id}"
-            elif not paper_id.startswith('https://openalex.org/'):
-                normalized_id = f"https://openalex.org/{paper_id}"
-            else:
-                normalized_id = paper_id
+            normalized_id = self._normalize_id(paper_id)
+            if not normalized_id:
+                return 0
             
             # Use the works API with a filter to count citations
             url = f"{self.base_url}/works"
@@ -499,41 +670,37 @@ class OpenAlexService:
                 'mailto': self.mailto
             }
             
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
+            response = self._request(url, params)
             
-            data = response.json()
+            data = _decode_json(response)
             meta = data.get('meta', {})
             count = meta.get('count', 0)
             
             return count
             
         except Exception as e:
-            print(f"❌ Error getting citation count for {paper_id}: {e}")
+            logger.warning("Error getting citation count for %s: %s", paper_id, e)
             return 0
     
     def _get_papers_individually(self, paper_ids: List[str]) -> List[Paper]:
         """
         Fallback method to get papers individually when batch processing fails.
         """
-        papers = []
-        for paper_id in paper_ids[:10]:  # Limit to first 10 to avoid too many requests
-            try:
-                paper = self.get_paper_by_id(paper_id)
-                if paper:
-                    papers.append(paper)
-                time.sleep(0.05)  # Add small delay between individual requests
-            except Exception as e:
-                print(f"Error getting individual paper {paper_id}: {e}")
-                continue
-        return papers
+        # Limit to first 10 to avoid too many requests; the rate limiter paces them
+        paper_ids = paper_ids[:10]
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(paper_ids) or 1)) as executor:
+            return [paper for paper in executor.map(self.get_paper_by_id, paper_ids) if paper]
     
-    def get_citations_batch(self, paper_ids: List[str]) -> Dict[str, List[str]]:
+    def get_citations_batch(self, paper_ids: List[str], per_page: int = 200) -> Dict[str, List[str]]:
         """
         Get citations for multiple papers efficiently using batch API.
         
+        IDs are split into filter-sized chunks that are requested concurrently;
+        each request still waits on the shared rate limiter.
+        
         Args:
             paper_ids: List of paper IDs
+            per_page: Number of citing works to fetch per chunk
             
         Returns:
             Dictionary mapping paper_id to list of citing paper IDs
@@ -544,62 +711,59 @@ class OpenAlexService:
         citations_map = {paper_id: [] for paper_id in paper_ids}
         
         try:
-            self.rate_limiter.wait_if_needed()
-            
-            # Normalize all paper IDs
-            openalex_ids = []
-            for paper_id in paper_ids:
-                is_valid, normalized_id = validate_paper_id(paper_id)
-                if is_valid:
-                    if not normalized_id.startswith('https://openalex.org/'):
-                        normalized_id = f"https://openalex.org/{normalized_id}"
-                    openalex_ids.append(normalized_id)
+            # Normalize all paper IDs, remembering which input each one came from
+            target_to_paper_id = self._openalex_targets(paper_ids)
             
-            if not openalex_ids:
+            if not target_to_paper_id:
                 return citations_map
             
             # Use OpenAlex API to get all works that cite any of our papers
-            # This is much more efficient than individual calls
-            filter_param = '|'.join(openalex_ids)
-            url = f"https://api.openalex.org/works"
-            params = {
-                'filter': f'cites:{filter_param}',
-                'per-page': 200,
-                'mailto': self.mailto
-            }
-            
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Process results to map citations back to original papers
-            if 'results' in data:
-                for work in data['results']:
-                    work_id = work.get('id', '')
-                    if not work_id:
-                        continue
-                    
-                    # Get the cited works from this paper
-                    cited_works = work.get('referenced_works', [])
-                    for cited_work in cited_works:
+            openalex_ids = list(target_to_paper_id)
+            chunks = [
+                openalex_ids[i:i + FILTER_CHUNK_SIZE]
+                for i in range(0, len(openalex_ids), FILTER_CHUNK_SIZE)
+            ]
+            url = f"{self.base_url}/works"
+            with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(chunks))) as executor:
+                responses = executor.map(
+                    lambda chunk: self._get_json(url, {
+                        'filter': f"cites:{'|'.join(chunk)}",
+                        'per-page': min(per_page, 200),  # OpenAlex max is 200
+                        'select': LINK_SELECT_FIELDS,
+                        'mailto': self.mailto
+                    }),
+                    chunks
+                )
+                
+                # Process results to map citations back to original papers
+                for data in responses:
+                    for work in data.get('results', []):
+                        work_id = work.get('id', '')
+                        if not work_id:
+                            continue
+                        
+                        # Extract just the ID part from the citing work
+                        citing_id = work_id.rpartition('openalex.org/')[2]
                         # Find which of our papers this work cites
-                        for i, target_id in enumerate(openalex_ids):
-                            if cited_work == target_id:
-                                paper_id = paper_ids[i]
-                                # Extract just the ID part from the citing work
-                                citing_id = work_id.split('openalex.org/')[-1] if 'openalex.org/' in work_id else work_id
+                        for cited_work in work.get('referenced_works', []):
+                            paper_id = target_to_paper_id.get(cited_work)
+                            if paper_id is not None:
                                 citations_map[paper_id].append(citing_id)
             
             return citations_map
             
         except Exception as e:
-            print(f"Error in batch citations retrieval: {e}")
+            logger.warning("Error in batch citations retrieval: %s", e)
             return citations_map
     
     def get_references_batch(self, paper_ids: List[str]) -> Dict[str, List[str]]:
         """
         Get references for multiple papers efficiently using batch API.
         
+        References already harvested from earlier Work payloads are served from
+        references_cache; the remaining papers are fetched in filter-sized chunks
+        that only select their referenced_works.
+        
         Args:
             paper_ids: List of paper IDs
             
@@ -612,68 +776,106 @@ class OpenAlexService:
         references_map = {paper_id: [] for paper_id in paper_ids}
         
         try:
-            self.rate_limiter.wait_if_needed()
-            
-            # Normalize all paper IDs
-            openalex_ids = []
-            for paper_id in paper_ids:
-                is_valid, normalized_id = validate_paper_id(paper_id)
-                if is_valid:
-                    if not normalized_id.startswith('https://openalex.org/'):
-                        normalized_id = f"https://openalex.org/{normalized_id}"
-                    openalex_ids.append(normalized_id)
+            # Normalize all paper IDs, remembering which input each one came from
+            target_to_paper_id = self._openalex_targets(paper_ids)
+            
+            missing_ids = []
+            for openalex_id, paper_id in target_to_paper_id.items():
+                cached = self._get_cached_references(openalex_id)
+                if cached is not None:
+                    references_map[paper_id] = cached
+                else:
+                    missing_ids.append(openalex_id)
             
-            if not openalex_ids:
+            if not missing_ids:
                 return references_map
             
-            # Use OpenAlex API to get all works that are cited by any of our papers
-            # This is much more efficient than individual calls
-            filter_param = '|'.join(openalex_ids)
-            url = f"https://api.openalex.org/works"
-            params = {
-                'filter': f'referenced_works:{filter_param}',
-                'per-page': 200,
-                'mailto': self.mailto
-            }
-            
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Process results to map references back to original papers
-            if 'results' in data:
-                for work in data['results']:
-                    work_id = work.get('id', '')
-                    if not work_id:
-                        continue
-                    
-                    # Get the referenced works from this paper
-                    referenced_works = work.get('referenced_works', [])
-                    for referenced_work in referenced_works:
-                        # Find which of our papers this work references
-                        for i, target_id in enumerate(openalex_ids):
-                            if referenced_work == target_id:
-                                paper_id = paper_ids[i]
-                                # Extract just the ID part from the referencing work
-                                ref_id = work_id.split('openalex.org/')[-1] if 'openalex.org/' in work_id else work_id
-                                references_map[paper_id].append(ref_id)
+            chunks = [
+                missing_ids[i:i + FILTER_CHUNK_SIZE]
+                for i in range(0, len(missing_ids), FILTER_CHUNK_SIZE)
+            ]
+            url = f"{self.base_url}/works"
+            with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(chunks))) as executor:
+                responses = executor.map(
+                    lambda chunk: self._get_json(url, {
+                        'filter': f"openalex:{'|'.join(chunk)}",
+                        'per-page': len(chunk),
+                        'select': LINK_SELECT_FIELDS,
+                        'mailto': self.mailto
+                    }),
+                    chunks
+                )
+                
+                # Map each returned Work's references back to the original input
+                for data in responses:
+                    for work in data.get('results', []):
+                        reference_ids = self._remember_references(work)
+                        paper_id = target_to_paper_id.get(work.get('id'))
+                        if paper_id is not None and reference_ids is not None:
+                            references_map[paper_id] = reference_ids
             
             return references_map
             
         except Exception as e:
-            print(f"Error in batch references retrieval: {e}")
+            logger.warning("Error in batch references retrieval: %s", e)
             return references_map
     
+    def _request(self, url: str, params: Dict[str, Any]) -> requests.Response:
+        """
+        GET through the circuit breaker, raising for error statuses.
+        
+        Transient failures are retried by the session's transport adapter; what
+        still fails afterwards counts towards opening the breaker.
+        
+        Args:
+            url: Request URL
+            params: Query parameters
+            
+        Returns:
+            Successful response
+        """
+        if not self.circuit_breaker.allow_request():
+            raise CircuitOpenError("OpenAlex circuit breaker is open")
+        
+        try:
+            response = self.session.get(url, params=params, timeout=REQUEST_TIMEOUT)
+        except Exception:
+            # Every outcome must be recorded, or a half-open trial call would never finish
+            self.circuit_breaker.record_failure()
+            raise
+        
+        if response.status_code == 429 or response.status_code >= 500:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+        response.raise_for_status()
+        return response
+    
+    def _get_json(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Rate-limited GET that returns the decoded JSON body.
+        
+        Args:
+            url: Request URL
+            params: Query parameters
+            
+        Returns:
+            Parsed JSON response
+        """
+        self.rate_limiter.wait_if_needed()
+        response = self._request(url, params)
+        return _decode_json(response)
+    
     def get_citations_and_references_batch(self, paper_ids: List[str], 
                                           cited_per_page: int = 200, 
                                           ref_per_page: int = 200) -> Dict[str, Dict[str, List[str]]]:
         """
-        Get both citations and references for multiple papers in a single API call.
+        Get both citations and references for multiple papers in one batch lookup.
         
         Args:
             paper_ids: List of paper IDs
             cited_per_page: Number of citations to fetch per API call (multiple of 200)
-            ref_per_page: Number of references to fetch per API call (multiple of 200)
+            ref_per_page: Unused; each paper's full referenced_works list is returned
             
         Returns:
             Dictionary mapping paper_id to {'citations': [...], 'references': [...]}
@@ -684,85 +886,42 @@ class OpenAlexService:
         result_map = {paper_id: {'citations': [], 'references': []} for paper_id in paper_ids}
         
         try:
-            self.rate_limiter.wait_if_needed()
+            # Citations come from the chunked cites: lookup; references are read from
+            # each paper's own referenced_works (cache first, then openalex: chunks)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                cites_future = executor.submit(self.get_citations_batch, paper_ids, cited_per_page)
+                refs_future = executor.submit(self.get_references_batch, paper_ids)
+                citations_map = cites_future.result()
+                references_map = refs_future.result()
             
-            # Normalize all paper IDs
-            openalex_ids = []
             for paper_id in paper_ids:
-                is_valid, normalized_id = validate_paper_id(paper_id)
-                if is_valid:
-                    if not normalized_id.startswith('https://openalex.org/'):
-                        normalized_id = f"https://openalex.org/{normalized_id}"
-                    openalex_ids.append(normalized_id)
-            
-            if not openalex_ids:
-                return result_map
-            
-            # Use OpenAlex API to get all works that cite OR are cited by any of our papers
-            # This combines both citations and references in one call
-            cites_filter = '|'.join(openalex_ids)
-            refs_filter = '|'.join(openalex_ids)
-            
-            # Make two calls but they're much more efficient than individual calls
-            # Call 1: Get works that cite our papers (citations)
-            cites_url = f"https://api.openalex.org/works"
-            cites_params = {
-                'filter': f'cites:{cites_filter}',
-                'per-page': min(cited_per_page, 200),  # OpenAlex max is 200
-                'mailto': self.mailto
-            }
-            refs_url = f"https://api.openalex.org/works"
-            refs_params = {
-                'filter': f'referenced_works:{refs_filter}',
-                'per-page': min(ref_per_page, 200),  # OpenAlex max is 200
-                'mailto': self.mailto
-            }
-            
-            # Execute both calls in parallel (simulated with sequential for now)
-            cites_response = self.session.get(cites_url, params=cites_params)
-            cites_response.raise_for_status()
-            cites_data = cites_response.json()
-            
-            # Small delay between calls to be respectful
-            time.sleep(0.1)
-            
-            refs_response = self.session.get(refs_url, params=refs_params)
-            refs_response.raise_for_status()
-            refs_data = refs_response.json()
-            
-            # Process citations results
-            if 'results' in cites_data:
-                for work in cites_data['results']:
-                    work_id = work.get('id', '')
-                    if not work_id:
-                        continue
-                    
-                    cited_works = work.get('referenced_works', [])
-                    for cited_work in cited_works:
-                        for i, target_id in enumerate(openalex_ids):
-                            if cited_work == target_id:
-                                paper_id = paper_ids[i]
-                                citing_id = work_id.split('openalex.org/')[-1] if 'openalex.org/' in work_id else work_id
-                                result_map[paper_id]['citations'].append(citing_id)
-            
-            # Process references results
-            if 'results' in refs_data:
-                for work in refs_data['results']:
-                    work_id = work.get('id', '')
-                    if not work_id:
-                        continue
-                    
-                    referenced_works = work.get('referenced_works', [])
-                    for referenced_work in referenced_works:
-                        for i, target_id in enumerate(openalex_ids):
-                            if referenced_work == target_id:
-                                paper_id = paper_ids[i]
-                                ref_id = work_id.split('openalex.org/')[-1] if 'openalex.org/' in work_id else work_id
-                                result_map[paper_id]['references'].append(ref_id)
+                result_map[paper_id]['citations'] = citations_map.get(paper_id, [])
+                result_map[paper_id]['references'] = references_map.get(paper_id, [])
             
             return result_map
             
         except Exception as e:
-            print(f"Error in combined citations/references retrieval: {e}")
+            logger.warning("Error in combined citations/references retrieval: %s", e)
             return result_map
 
+
+_shared_service: Optional[OpenAlexService] = None
+_shared_service_lock = threading.Lock()
+
+
+def get_shared_openalex_service() -> OpenAlexService:
+    """
+    Get the process-wide OpenAlexService instance.
+    
+    Sharing one instance means every route and graph build reuses the same
+    connection pool, rate limiter and paper cache. Set REFNET_DISK_CACHE_DIR
+    to also persist fetched papers and references across runs.
+    
+    Returns:
+        Shared OpenAlexService
+    """
+    global _shared_service
+    with _shared_service_lock:
+        if _shared_service is None:
+            _shared_service = OpenAlexService(disk_cache_dir=os.getenv('REFNET_DISK_CACHE_DIR') or None)
+        return _shared_service
@@ -1,36 +1,45 @@
 """Tests for RefNet models."""
 
+import dataclasses
 import unittest
-from datetime import datetime
 
 from refnet.models.paper import Paper, PaperFormatter
 from refnet.models.graph import GraphMetadata, GraphNode, GraphEdge
 
+_FIXED_TS = "2023-01-01T00:00:00"
+
+_PAPER_KWARGS = {
+    'id': "test-id",
+    'title': "Test Paper",
+    'authors': ["Author 1", "Author 2"],
+    'year': 2023,
+    'abstract': "Test abstract",
+    'doi': "10.1000/test",
+    'citations': 10,
+    'venue': "Test Venue",
+    'topics': ["AI", "ML"],
+    'type': "journal-article",
+    'language': "en",
+    'is_open_access': True,
+    'openalex_url': "https://openalex.org/test-id",
+    'pdf_url': "https://example.com/paper.pdf",
+    'publication_date': "2023-01-01",
+    'referenced_works_count': 20,
+    'related_works_count': 5
+}
+
 
 class TestPaper(unittest.TestCase):
     """Test cases for Paper model."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build the shared Paper fixture once for the class."""
+        cls.paper = Paper(**_PAPER_KWARGS)
+    
     def test_paper_creation(self):
         """Test creating a Paper object."""
-        paper = Paper(
-            id="test-id",
-            title="Test Paper",
-            authors=["Author 1", "Author 2"],
-            year=2023,
-            abstract="Test abstract",
-            doi="10.1000/test",
-            citations=10,
-            venue="Test Venue",
-            topics=["AI", "ML"],
-            type="journal-article",
-            language="en",
-            is_open_access=True,
-            openalex_url="https://openalex.org/test-id",
-            pdf_url="https://example.com/paper.pdf",
-            publication_date="2023-01-01",
-            referenced_works_count=20,
-            related_works_count=5
-        )
+        paper = self.paper
         
         self.assertEqual(paper.id, "test-id")
         self.assertEqual(paper.title, "Test Paper")
@@ -40,39 +49,23 @@ class TestPaper(unittest.TestCase):
     
     def test_paper_to_dict(self):
         """Test converting Paper to dictionary."""
-        paper = Paper(
-            id="test-id",
-            title="Test Paper",
-            authors=["Author 1"],
-            year=2023,
-            abstract="Test abstract",
-            doi="10.1000/test",
-            citations=10,
-            venue="Test Venue",
-            topics=["AI"],
-            type="journal-article",
-            language="en",
-            is_open_access=True,
-            openalex_url="https://openalex.org/test-id",
-            pdf_url=None,
-            publication_date="2023-01-01",
-            referenced_works_count=20,
-            related_works_count=5
-        )
+        paper = dataclasses.replace(self.paper, pdf_url=None)
         
         paper_dict = paper.to_dict()
         self.assertIsInstance(paper_dict, dict)
         self.assertEqual(paper_dict['id'], "test-id")
         self.assertEqual(paper_dict['title'], "Test Paper")
         self.assertEqual(paper_dict['citations'], 10)
+        self.assertIsNone(paper_dict['pdf_url'])
 
 
 class TestPaperFormatter(unittest.TestCase):
     """Test cases for PaperFormatter."""
     
-    def test_format_valid_paper(self):
-        """Test formatting a valid paper."""
-        raw_paper = {
+    @classmethod
+    def setUpClass(cls):
+        """Build the shared raw OpenAlex Work once for the class."""
+        cls.raw_paper = {
             'id': 'https://openalex.org/test-id',
             'title': 'Test Paper',
             'authorships': [
@@ -93,8 +86,10 @@ class TestPaperFormatter(unittest.TestCase):
             'referenced_works': ['ref1', 'ref2'],
             'related_works': ['rel1']
         }
-        
-        paper = PaperFormatter.format_paper_data(raw_paper)
+    
+    def test_format_valid_paper(self):
+        """Test formatting a valid paper."""
+        paper = PaperFormatter.format_paper_data(self.raw_paper)
         self.assertIsNotNone(paper)
         self.assertEqual(paper.title, 'Test Paper')
         self.assertEqual(len(paper.authors), 2)
@@ -124,7 +119,7 @@ class TestGraphMetadata(unittest.TestCase):
         metadata = GraphMetadata(
             total_papers=10,
             total_citations=20,
-            generated_at=datetime.now().isoformat(),
+            generated_at=_FIXED_TS,
             graph_density=0.5,
             is_connected=True,
             average_degree=2.0,
@@ -142,7 +137,7 @@ class TestGraphMetadata(unittest.TestCase):
         metadata = GraphMetadata(
             total_papers=10,
             total_citations=20,
-            generated_at=datetime.now().isoformat(),
+            generated_at=_FIXED_TS,
             graph_density=0.5,
             is_connected=True
         )
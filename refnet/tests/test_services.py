@@ -0,0 +1,160 @@
+"""Tests for RefNet services."""
+
+import json
+import threading
+import unittest
+
+import networkx as nx
+import numpy as np
+from networkx.drawing.layout import _fruchterman_reingold as nx_fruchterman_reingold
+import requests
+from scipy import sparse
+
+from refnet.models.paper import PaperFormatter
+from refnet.services.graph_service import GraphService, _fruchterman_reingold
+from refnet.services.openalex_service import OpenAlexService
+
+
+def _work(index):
+    """Build a minimal raw OpenAlex Work."""
+    return {'id': f'https://openalex.org/W{index}', 'title': f'Paper {index}', 'cited_by_count': index}
+
+
+def _response(status_code, payload=None):
+    """Build a requests Response with a JSON body."""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(payload or {}).encode()
+    return response
+
+
+class FakeSession:
+    """Stands in for requests.Session, answering openalex: filters from a fixed set of Works."""
+    
+    def __init__(self, rate_limited_id=None):
+        """Record every filter; chunks containing rate_limited_id get a 429."""
+        self.rate_limited_id = rate_limited_id
+        self.filters = []
+        self._lock = threading.Lock()
+    
+    def get(self, url, params=None, timeout=None):
+        """Answer single-Work lookups with 404 and batch filters with their Works."""
+        if '/works/' in url:
+            return _response(404)
+        
+        ids = params['filter'][len('openalex:'):].split('|')
+        with self._lock:
+            self.filters.append(ids)
+        if self.rate_limited_id in ids:
+            return _response(429)
+        return _response(200, {'results': [_work(openalex_id.rpartition('/W')[2]) for openalex_id in ids]})
+
+
+class TestFruchtermanReingold(unittest.TestCase):
+    """Test cases for the numpy Fruchterman-Reingold layout."""
+    
+    def test_matches_networkx(self):
+        """Test that the layout follows networkx's force model from the same start positions."""
+        graph = nx.gnp_random_graph(12, 0.3, seed=1, directed=True)
+        # networkx counts a reciprocal pair as weight 2, so keep one direction of each pair
+        graph.remove_edges_from([(u, v) for u, v in list(graph.edges()) if u > v and graph.has_edge(v, u)])
+        adjacency = nx.to_scipy_sparse_array(graph, weight=None, format='csr')
+        
+        pos = _fruchterman_reingold(adjacency, iterations=30, k=2, seed=7)
+        
+        start = np.random.default_rng(7).random((12, 2))
+        expected = nx_fruchterman_reingold(
+            (adjacency + adjacency.T).toarray().astype(float), k=2, pos=start,
+            iterations=30, threshold=0
+        )
+        np.testing.assert_allclose(pos, expected, atol=1e-9)
+    
+    def test_small_graphs(self):
+        """Test output shape and finiteness, including graphs with fewer than two nodes."""
+        for num_nodes in (0, 1, 5):
+            adjacency = sparse.csr_matrix(np.eye(num_nodes, k=1))
+            
+            pos = _fruchterman_reingold(adjacency, iterations=10, seed=0)
+            self.assertEqual(pos.shape, (num_nodes, 2))
+            self.assertTrue(np.isfinite(pos).all())
+
+
+
+class TestGetPapersBatch(unittest.TestCase):
+    """Test cases for OpenAlexService.get_papers_batch."""
+    
+    def setUp(self):
+        """Create a service without rate-limit delays."""
+        self.service = OpenAlexService(rate_limit_delay=0)
+    
+    def test_splits_missing_ids_into_filter_chunks(self):
+        """Test that more than 50 IDs are requested as openalex: filters of at most 50 IDs."""
+        self.service.session = FakeSession()
+        
+        papers = self.service.get_papers_batch([f'W{i}' for i in range(1, 121)])
+        
+        self.assertEqual(len(papers), 120)
+        self.assertEqual(sorted(len(ids) for ids in self.service.session.filters), [20, 50, 50])
+        requested = [openalex_id for ids in self.service.session.filters for openalex_id in ids]
+        self.assertEqual(len(set(requested)), 120)
+    
+    def test_cached_ids_skip_http(self):
+        """Test that cached papers are returned without being requested again."""
+        self.service.session = FakeSession()
+        cached = PaperFormatter.format_paper_data(_work(1))
+        self.service.paper_cache[cached.id] = cached
+        
+        papers = self.service.get_papers_batch(['W1', 'W2'])
+        
+        self.assertIn(cached, papers)
+        self.assertEqual(len(papers), 2)
+        self.assertEqual(self.service.session.filters, [['https://openalex.org/W2']])
+        
+        self.service.session.filters.clear()
+        self.service.get_papers_batch(['W1', 'W2'])
+        self.assertEqual(self.service.session.filters, [])
+    
+    def test_rate_limited_chunk_keeps_other_chunks(self):
+        """Test that a 429 on one chunk does not discard the papers from the others."""
+        self.service.session = FakeSession(rate_limited_id='https://openalex.org/W1')
+        
+        papers = self.service.get_papers_batch([f'W{i}' for i in range(1, 121)])
+        
+        # W1..W50 hit the 429 (and 404 individually); the other two chunks still arrive
+        self.assertEqual({paper.id for paper in papers},
+                         {f'https://openalex.org/W{i}' for i in range(51, 121)})
+
+
+
+class TestGraphColumns(unittest.TestCase):
+    """Test cases for GraphService.get_graph_columns."""
+    
+    def test_matches_graph_data(self):
+        """Test that the columns format has the same ids, coordinates and edges as the records format."""
+        service = GraphService(openalex_service=OpenAlexService(rate_limit_delay=0))
+        for index in range(1, 6):
+            paper = PaperFormatter.format_paper_data(dict(_work(index), authorships=[
+                {'author': {'display_name': f'Author {index}'}}
+            ]))
+            service.add_paper_to_graph(paper.id, is_root=index == 1, paper_data=paper)
+        service.graph.add_edges_from([
+            ('https://openalex.org/W2', 'https://openalex.org/W1'),
+            ('https://openalex.org/W3', 'https://openalex.org/W1'),
+            ('https://openalex.org/W1', 'https://openalex.org/W4')
+        ])
+        service._mark_dirty()
+        
+        records = service.get_graph_data()
+        columns = service.get_graph_columns()
+        
+        self.assertEqual(columns['nodes']['id'], [node['id'] for node in records['nodes']])
+        self.assertEqual(columns['nodes']['x'], [node['x'] for node in records['nodes']])
+        self.assertEqual(columns['nodes']['y'], [node['y'] for node in records['nodes']])
+        self.assertEqual(
+            list(zip(columns['edges']['source'], columns['edges']['target'])),
+            [(edge['source'], edge['target']) for edge in records['edges']]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
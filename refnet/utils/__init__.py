@@ -1,7 +1,10 @@
 """Utility functions for RefNet."""
 
-from .validators import validate_paper_id, validate_search_params
+from .validators import validate_paper_id, validate_paper_id_fast, validate_search_params
 from .rate_limiter import RateLimiter
+from .cache import LRUCache
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
 
-__all__ = ['validate_paper_id', 'validate_search_params', 'RateLimiter']
+__all__ = ['validate_paper_id', 'validate_paper_id_fast', 'validate_search_params',
+           'RateLimiter', 'LRUCache', 'CircuitBreaker', 'CircuitOpenError']
 
@@ -0,0 +1,53 @@
+"""Caching utilities for RefNet."""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUCache(OrderedDict):
+    """Dictionary that evicts its least recently used entries beyond maxsize.
+    
+    Reads, writes and clears are serialized so one cache can be shared
+    across threads.
+    """
+    
+    def __init__(self, maxsize: int = 50_000):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of entries to keep
+        """
+        super().__init__()
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+    
+    def __getitem__(self, key: Hashable) -> Any:
+        """Look up an entry and mark it as most recently used."""
+        with self._lock:
+            value = super().__getitem__(key)
+            self.move_to_end(key)
+            return value
+    
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Look up an entry in one step, returning default if it is missing."""
+        with self._lock:
+            if key not in self:
+                return default
+            value = super().__getitem__(key)
+            self.move_to_end(key)
+            return value
+    
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        """Store an entry, evicting the oldest ones if the cache is full."""
+        with self._lock:
+            super().__setitem__(key, value)
+            self.move_to_end(key)
+            while len(self) > self.maxsize:
+                self.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            super().clear()
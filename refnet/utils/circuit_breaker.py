@@ -0,0 +1,58 @@
+"""Circuit breaker for calls to an external API."""
+
+import threading
+import time
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is refused because the circuit is open."""
+
+
+class CircuitBreaker:
+    """Refuses calls for a cool-down period after repeated consecutive failures.
+    
+    Once the cool-down ends the circuit is half-open: a single trial call is
+    let through and every other call is refused until that trial succeeds
+    (closing the circuit) or fails (opening it again).
+    """
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize circuit breaker.
+        
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial call is allowed
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._consecutive_failures = 0
+        self._open_until = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    def allow_request(self) -> bool:
+        """Check whether a call may go out now, claiming the trial call when half-open."""
+        with self._lock:
+            if self._consecutive_failures < self.failure_threshold:
+                return True
+            if time.monotonic() < self._open_until or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+    
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self._consecutive_failures = 0
+            self._open_until = 0.0
+            self._trial_in_flight = False
+    
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit once the threshold is reached."""
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._consecutive_failures >= self.failure_threshold:
+                # A failed trial call after the cool-down reopens the circuit straight away
+                self._open_until = time.monotonic() + self.reset_timeout
+                self._trial_in_flight = False
@@ -1,34 +1,52 @@
 """Rate limiting utilities for API calls."""
 
+import threading
 import time
 from typing import Optional
 
 
 class RateLimiter:
-    """Simple rate limiter to control API call frequency."""
+    """Token-bucket rate limiter to control API call frequency."""
     
-    def __init__(self, delay: float = 0.2, max_retries: int = 1):
+    __slots__ = ('delay', 'max_retries', 'burst', '_tokens', '_last_refill', '_lock')
+    
+    def __init__(self, delay: float = 0.2, max_retries: int = 1, burst: int = 1):
         """
         Initialize rate limiter.
         
         Args:
-            delay: Minimum delay between API calls in seconds
+            delay: Average delay between API calls in seconds (one token per delay)
             max_retries: Maximum number of retries for failed calls
+            burst: Number of calls allowed back to back after an idle period
         """
         self.delay = delay
         self.max_retries = max_retries
-        self.last_call_time = 0.0
+        self.burst = burst
+        # Start full so the first burst of calls goes out immediately
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        # Serializes callers so the limiter can be shared across threads
+        self._lock = threading.Lock()
     
     def wait_if_needed(self) -> None:
-        """Wait if necessary to respect rate limits."""
-        now = time.time()
-        time_since_last_call = now - self.last_call_time
-        
-        if time_since_last_call < self.delay:
-            sleep_time = self.delay - time_since_last_call
-            time.sleep(sleep_time)
+        """Take one token, waiting for the bucket to refill if it is empty."""
+        if self.delay <= 0:
+            return
         
-        self.last_call_time = time.time()
+        with self._lock:
+            now = time.monotonic()
+            tokens = min(self.burst, self._tokens + (now - self._last_refill) / self.delay)
+            
+            if tokens < 1:
+                # Sleep until one token has accrued, then spend it; the refill
+                # deadline is known, so the clock isn't read again after sleeping
+                wait = (1 - tokens) * self.delay
+                time.sleep(wait)
+                self._last_refill = now + wait
+                self._tokens = 0.0
+            else:
+                self._last_refill = now
+                self._tokens = tokens - 1
     
     def should_retry(self, attempt: int) -> bool:
         """
@@ -41,4 +59,3 @@ class RateLimiter:
             True if we should retry, False otherwise
         """
         return attempt < self.max_retries
-
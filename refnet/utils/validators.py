@@ -1,7 +1,35 @@
 """Validation utilities for RefNet."""
 
+import re
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, Any, Tuple, Optional
 
+_OPENALEX_PREFIX = "https://openalex.org/"
+_DOI_PREFIX = "https://doi.org/"
+# One anchored match classifies an ID as bare DOI, DOI URL or OpenAlex URL
+_ID_PREFIX_RE = re.compile(r'(10\.|https://doi\.org/|https://openalex\.org/)')
+
+# Shared, read-only cleaned_params for every failed validation
+_EMPTY_PARAMS = MappingProxyType({})
+
+_VALID_SORTS_ORDER = ('cited_by_count', 'relevance_score', 'publication_date')
+_VALID_SORTS = frozenset(_VALID_SORTS_ORDER)
+_SORT_ERROR = f"Sort must be one of: {', '.join(_VALID_SORTS_ORDER)}"
+# (param, default, range check, range error, cast error) for each integer search parameter
+_SEARCH_INT_SCHEMA = (
+    ('page', 1, lambda v: v >= 1,
+     "Page must be a positive integer", "Page must be a valid integer"),
+    ('per_page', 25, lambda v: 1 <= v <= 50,
+     "Per page must be between 1 and 50", "Per page must be a valid integer"),
+)
+# (param, default, minimum error, cast error) for each graph parameter; all must be >= 1
+_GRAPH_INT_SCHEMA = (
+    ('iterations', 3, "Iterations must be at least 1", "Iterations must be a valid integer"),
+    ('cited_limit', 10, "Cited limit must be at least 1", "Cited limit must be a valid integer"),
+    ('ref_limit', 10, "Reference limit must be at least 1", "Reference limit must be a valid integer"),
+)
+
 
 def validate_paper_id(paper_id: str) -> Tuple[bool, str]:
     """
@@ -16,19 +44,34 @@ def validate_paper_id(paper_id: str) -> Tuple[bool, str]:
     if not paper_id or not isinstance(paper_id, str):
         return False, ""
     
+    return validate_paper_id_fast(paper_id)
+
+
+@lru_cache(maxsize=200_000)
+def validate_paper_id_fast(paper_id: str) -> Tuple[bool, str]:
+    """
+    Validate and normalize a paper ID already known to be a string.
+    
+    Skips validate_paper_id's type guard for internal callers that pass IDs
+    taken from OpenAlex data. Memoized, since graph builds repeat IDs heavily.
+    
+    Args:
+        paper_id: The paper ID to validate (must be a str)
+        
+    Returns:
+        Tuple of (is_valid, normalized_id)
+    """
     paper_id = paper_id.strip()
     if not paper_id:
         return False, ""
     
-    # Normalize the ID
-    if paper_id.startswith('10.'):
-        normalized_id = f"https://doi.org/{paper_id}"
-    elif not paper_id.startswith('https://openalex.org/'):
-        normalized_id = f"https://openalex.org/{paper_id}"
-    else:
-        normalized_id = paper_id
-    
-    return True, normalized_id
+    # Normalize the ID; DOI and OpenAlex URLs are already canonical
+    match = _ID_PREFIX_RE.match(paper_id)
+    if match is None:
+        return True, _OPENALEX_PREFIX + paper_id
+    if match.group(1) == '10.':
+        return True, _DOI_PREFIX + paper_id
+    return True, paper_id
 
 
 def validate_search_params(params: Dict[str, Any]) -> Tuple[bool, str, Dict[str, Any]]:
@@ -46,32 +89,23 @@ def validate_search_params(params: Dict[str, Any]) -> Tuple[bool, str, Dict[str,
     # Validate query
     query = params.get('q', '').strip()
     if not query:
-        return False, "Query parameter 'q' is required", {}
+        return False, "Query parameter 'q' is required", _EMPTY_PARAMS
     cleaned_params['query'] = query
     
-    # Validate page
-    try:
-        page = int(params.get('page', 1))
-        if page < 1:
-            return False, "Page must be a positive integer", {}
-        cleaned_params['page'] = page
-    except (ValueError, TypeError):
-        return False, "Page must be a valid integer", {}
-    
-    # Validate per_page
-    try:
-        per_page = int(params.get('per_page', 25))
-        if per_page < 1 or per_page > 50:
-            return False, "Per page must be between 1 and 50", {}
-        cleaned_params['per_page'] = per_page
-    except (ValueError, TypeError):
-        return False, "Per page must be a valid integer", {}
+    # Validate page and per_page
+    for key, default, in_range, range_error, cast_error in _SEARCH_INT_SCHEMA:
+        try:
+            value = int(params.get(key, default))
+        except (ValueError, TypeError):
+            return False, cast_error, _EMPTY_PARAMS
+        if not in_range(value):
+            return False, range_error, _EMPTY_PARAMS
+        cleaned_params[key] = value
     
     # Validate sort_by
-    valid_sorts = ['cited_by_count', 'relevance_score', 'publication_date']
     sort_by = params.get('sort', 'cited_by_count')
-    if sort_by not in valid_sorts:
-        return False, f"Sort must be one of: {', '.join(valid_sorts)}", {}
+    if not isinstance(sort_by, str) or sort_by not in _VALID_SORTS:
+        return False, _SORT_ERROR, _EMPTY_PARAMS
     cleaned_params['sort_by'] = sort_by
     
     return True, "", cleaned_params
@@ -89,32 +123,15 @@ def validate_graph_params(params: Dict[str, Any]) -> Tuple[bool, str, Dict[str,
     """
     cleaned_params = {}
     
-    # Validate iterations - No upper limit for unlimited exploration
-    try:
-        iterations = int(params.get('iterations', 3))
-        if iterations < 1:
-            return False, "Iterations must be at least 1", {}
-        cleaned_params['iterations'] = iterations
-    except (ValueError, TypeError):
-        return False, "Iterations must be a valid integer", {}
-    
-    # Validate cited_limit - No upper limit for unlimited exploration
-    try:
-        cited_limit = int(params.get('cited_limit', 10))
-        if cited_limit < 1:
-            return False, "Cited limit must be at least 1", {}
-        cleaned_params['cited_limit'] = cited_limit
-    except (ValueError, TypeError):
-        return False, "Cited limit must be a valid integer", {}
-    
-    # Validate ref_limit - No upper limit for unlimited exploration
-    try:
-        ref_limit = int(params.get('ref_limit', 10))
-        if ref_limit < 1:
-            return False, "Reference limit must be at least 1", {}
-        cleaned_params['ref_limit'] = ref_limit
-    except (ValueError, TypeError):
-        return False, "Reference limit must be a valid integer", {}
+    # No upper limits, to allow unlimited exploration
+    for key, default, range_error, cast_error in _GRAPH_INT_SCHEMA:
+        try:
+            value = int(params.get(key, default))
+        except (ValueError, TypeError):
+            return False, cast_error, _EMPTY_PARAMS
+        if value < 1:
+            return False, range_error, _EMPTY_PARAMS
+        cleaned_params[key] = value
     
     return True, "", cleaned_params
 